@@ -4,81 +4,293 @@ Provides WavLM embedding analysis, spectral artifact detection,
 prosody analysis, and ensemble classification.
 """
 
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import torch
 import torchaudio
-import librosa
+from numba import njit, prange
 from transformers import WavLMModel, AutoFeatureExtractor
 
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
 TARGET_SR = 16000
 MAX_DURATION_SEC = 5
 MAX_LENGTH = TARGET_SR * MAX_DURATION_SEC
 
 
-def load_audio_numpy(audio_path: str) -> np.ndarray:
+@functools.lru_cache(maxsize=None)
+def _get_resampler(orig_sr: int, device: torch.device) -> torchaudio.transforms.Resample:
+    """Resample kernels are built once per (source rate, device) and reused."""
+    return torchaudio.transforms.Resample(orig_sr, TARGET_SR).to(device)
+
+
+def load_audio(audio_path: str, device: torch.device = torch.device("cpu")):
     """Load audio, convert to mono 16kHz, truncate/pad to 5s, normalize.
-    Mirrors inference.py preprocessing exactly."""
+    Mirrors inference.py preprocessing exactly. Resampling, padding and
+    normalization run on `device`; returns (numpy copy, device tensor)."""
     waveform, sr = torchaudio.load(audio_path)
+    waveform = waveform.to(device)
     if waveform.shape[0] > 1:
         waveform = waveform.mean(dim=0, keepdim=True)
     waveform = waveform.squeeze(0)
     if sr != TARGET_SR:
-        resampler = torchaudio.transforms.Resample(sr, TARGET_SR)
-        waveform = resampler(waveform)
+        waveform = _get_resampler(sr, device)(waveform)
     if waveform.shape[0] > MAX_LENGTH:
         waveform = waveform[:MAX_LENGTH]
     elif waveform.shape[0] < MAX_LENGTH:
         padding = MAX_LENGTH - waveform.shape[0]
         waveform = torch.nn.functional.pad(waveform, (0, padding))
-    waveform = waveform.numpy()
-    if np.max(np.abs(waveform)) > 0:
-        waveform = waveform / np.max(np.abs(waveform))
-    return waveform
+    waveform.div_(waveform.abs().max().clamp_min_(1e-8))
+    return waveform.cpu().numpy(), waveform
+
+
+def load_audio_numpy(audio_path: str) -> np.ndarray:
+    """CPU-only variant of load_audio that returns just the numpy array."""
+    audio_np, _ = load_audio(audio_path)
+    return audio_np
 
 
 # ============================================================
 # WavLM Embedding Analyzer
 # ============================================================
+class _WavLMHiddenStates(torch.nn.Module):
+    """ONNX export wrapper that returns only the hidden states the analyzer reads."""
+
+    def __init__(self, model: WavLMModel):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_values):
+        outputs = self.model(input_values=input_values)
+        return outputs.last_hidden_state, outputs.hidden_states[4], outputs.hidden_states[11]
+
+
 class WavLMAnalyzer:
     """Analyzes audio using pre-trained WavLM hidden states.
-    AI audio tends to have lower temporal variance and entropy."""
+    AI audio tends to have lower temporal variance and entropy.
+
+    With quantize=True the Linear layers run in int8: bitsandbytes 8-bit
+    on CUDA, torch dynamic quantization on CPU. With onnx_path set, the
+    model is exported there once and run through ONNX Runtime instead.
 
-    def __init__(self, device: torch.device):
+    bf16=True runs WavLM in bf16 on Ampere+ GPUs instead of fp16. Opt-in:
+    the score thresholds were calibrated on fp16 features, and the layer
+    divergence sigmoid is narrow enough that bf16's 8-bit mantissa shifts
+    scores; re-check the thresholds before enabling it."""
+
+    ONNX_OUTPUTS = ("last_hidden", "h4", "h11")
+
+    def __init__(self, device: torch.device, quantize: bool = False,
+                 onnx_path: str | None = None, bf16: bool = False):
         self.device = device
-        self.feature_extractor = AutoFeatureExtractor.from_pretrained(
+        # Only the normalization flag is needed; the input is already a fixed
+        # 5s 16kHz clip, so the HF feature extractor call itself is skipped.
+        self.do_normalize = AutoFeatureExtractor.from_pretrained(
             "microsoft/wavlm-base"
-        )
-        self.model = WavLMModel.from_pretrained(
-            "microsoft/wavlm-base",
-            torch_dtype=torch.float16,
-            output_hidden_states=True,
-        ).to(device)
+        ).do_normalize
+        # ONNX Runtime IO binding has no bf16 buffer type, so ONNX stays fp16 on
+        # GPU; its CPU provider has few fp16 kernels, so CPU exports run fp32
+        if onnx_path:
+            half = torch.float16 if device.type == "cuda" else torch.float32
+        else:
+            half = self._half_dtype(device, bf16)
+        self.model, self.quantized = self._load_model(device, quantize, half)
         self.model.eval()
+        # Dynamic int8 on CPU keeps fp32 activations; every other path is half
+        self.dtype = (
+            torch.float32 if self.quantized and device.type == "cpu" else half
+        )
+        self.session = self._load_onnx(onnx_path) if onnx_path else None
 
-    @torch.no_grad()
-    def analyze(self, audio_np: np.ndarray) -> dict:
-        inputs = self.feature_extractor(
-            audio_np, sampling_rate=TARGET_SR, return_tensors="pt", padding=False
+        # Persistent pinned staging buffer for host clips, so the H2D copy can
+        # run asynchronously. One buffer per analyzer: calls must not overlap.
+        self._pinned = (
+            torch.empty(MAX_LENGTH, dtype=torch.float32).pin_memory()
+            if device.type == "cuda" else None
         )
-        input_values = inputs.input_values.to(self.device, dtype=torch.float16)
 
-        outputs = self.model(input_values=input_values)
-        last_hidden = outputs.last_hidden_state.float().squeeze(0)  # (T, 768)
+        if device.type == "cuda":
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.benchmark = True
+
+        if device.type == "cuda" and not self.quantized and self.session is None:
+            # bitsandbytes kernels are not CUDA-graph safe, so 8-bit skips this.
+            # Input is always MAX_LENGTH samples, so the compiled graph is
+            # captured once as a CUDA graph and replayed on every request.
+            self.model = torch.compile(self.model, mode="reduce-overhead")
+            self._warmup()
+
+    @staticmethod
+    def _half_dtype(device: torch.device, bf16: bool) -> torch.dtype:
+        if bf16 and device.type == "cuda" and torch.cuda.get_device_capability(device)[0] >= 8:
+            return torch.bfloat16
+        return torch.float16
+
+    @classmethod
+    def _load_model(cls, device: torch.device, quantize: bool,
+                    half: torch.dtype) -> tuple[WavLMModel, bool]:
+        """Return (model on device, whether it is int8-quantized)."""
+        if quantize and device.type == "cuda":
+            try:
+                from transformers import BitsAndBytesConfig
+                model = cls._from_pretrained(
+                    torch_dtype=half,
+                    quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                    device_map={"": device.index or 0},
+                )
+                return model, True
+            except (ImportError, ValueError) as e:
+                print(f"[!] 8-bit WavLM unavailable ({e}); using {half} weights")
+        elif quantize:
+            model = cls._from_pretrained(torch_dtype=torch.float32)
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            return model, True
+        return cls._from_pretrained(torch_dtype=half).to(device), False
+
+    @staticmethod
+    def _from_pretrained(**kwargs) -> WavLMModel:
+        """Load WavLM with fused SDPA attention, falling back to the eager
+        attention path on transformers versions where WavLM lacks SDPA."""
+        kwargs["output_hidden_states"] = True
+        try:
+            return WavLMModel.from_pretrained(
+                "microsoft/wavlm-base", attn_implementation="sdpa", **kwargs
+            )
+        except (ValueError, ImportError) as e:
+            print(f"[!] SDPA attention unavailable for WavLM ({e}); using default attention")
+            return WavLMModel.from_pretrained("microsoft/wavlm-base", **kwargs)
 
-        # Temporal variance: mean variance across time for each dimension
-        temporal_var = last_hidden.var(dim=0).mean().item()
+    @torch.no_grad()
+    def _warmup(self, steps: int = 3):
+        """Trigger compilation + CUDA graph capture at load time, not on the first request."""
+        dummy = torch.zeros(1, MAX_LENGTH, dtype=self.dtype, device=self.device)
+        for _ in range(steps):
+            self._forward(dummy)
+
+    def _load_onnx(self, onnx_path: str):
+        """Export WavLM to ONNX on first use and open an ONNX Runtime session."""
+        if ort is None:
+            print("[!] onnxruntime not installed; using the PyTorch WavLM")
+            return None
+        if self.quantized:
+            print("[!] Quantized WavLM cannot be exported to ONNX; using PyTorch")
+            return None
+
+        if not os.path.exists(onnx_path):
+            print(f"[*] Exporting WavLM to {onnx_path}...")
+            dummy = torch.zeros(1, MAX_LENGTH, dtype=self.dtype, device=self.device)
+            batch_axis = {0: "batch"}
+            torch.onnx.export(
+                _WavLMHiddenStates(self.model), (dummy,), onnx_path,
+                input_names=["input_values"],
+                output_names=list(self.ONNX_OUTPUTS),
+                dynamic_axes={n: batch_axis for n in ("input_values", *self.ONNX_OUTPUTS)},
+                opset_version=17,
+            )
+
+        providers = ["CPUExecutionProvider"]
+        if self.device.type == "cuda":
+            providers.insert(0, ("CUDAExecutionProvider", {"device_id": self.device.index or 0}))
+        session = ort.InferenceSession(onnx_path, providers=providers)
+
+        # Output shape is fixed by MAX_LENGTH, so output buffers can be preallocated
+        self._n_frames = int(self.model._get_feat_extract_output_lengths(torch.tensor(MAX_LENGTH)))
+        self._hidden_size = self.model.config.hidden_size
+        return session
+
+    def _forward(self, input_values: torch.Tensor):
+        """(last hidden state, layer 4, layer 11) from ONNX Runtime or PyTorch."""
+        if self.session is None:
+            outputs = self.model(input_values=input_values)
+            return outputs.last_hidden_state, outputs.hidden_states[4], outputs.hidden_states[11]
+
+        # IO binding on raw device pointers: input and outputs never leave self.device
+        input_values = input_values.contiguous()
+        elem_type = np.float16 if self.dtype == torch.float16 else np.float32
+        dev_type, dev_id = self.device.type, self.device.index or 0
+        outputs = [
+            torch.empty(input_values.shape[0], self._n_frames, self._hidden_size,
+                        dtype=self.dtype, device=self.device)
+            for _ in self.ONNX_OUTPUTS
+        ]
+        binding = self.session.io_binding()
+        binding.bind_input("input_values", dev_type, dev_id, elem_type,
+                           tuple(input_values.shape), input_values.data_ptr())
+        for name, out in zip(self.ONNX_OUTPUTS, outputs):
+            binding.bind_output(name, dev_type, dev_id, elem_type,
+                                tuple(out.shape), out.data_ptr())
+        if self.device.type == "cuda":
+            # ORT runs on its own stream; make sure the input is written first
+            torch.cuda.current_stream(self.device).synchronize()
+        self.session.run_with_iobinding(binding)
+        binding.synchronize_outputs()
+        return outputs
+
+    def _to_device(self, audio) -> torch.Tensor:
+        """Move a clip to the model device; host arrays go through the pinned buffer."""
+        if self._pinned is not None and isinstance(audio, np.ndarray) and audio.shape == (MAX_LENGTH,):
+            self._pinned.copy_(torch.from_numpy(audio))
+            return self._pinned.to(self.device, non_blocking=True)
+        return torch.as_tensor(audio, dtype=torch.float32, device=self.device)
 
-        # Embedding entropy: discretize hidden values and compute Shannon entropy
-        flat_values = last_hidden.cpu().numpy().flatten()
-        hist, _ = np.histogram(flat_values, bins=50, density=True)
-        hist = hist[hist > 0]
-        entropy = float(-np.sum(hist * np.log2(hist + 1e-10)))
+    @torch.no_grad()
+    def analyze(self, audio) -> dict:
+        # Same zero-mean / unit-variance step as Wav2Vec2FeatureExtractor, done in
+        # fp32 on-device before the cast to the model dtype
+        input_values = self._to_device(audio).unsqueeze(0)
+        if self.do_normalize:
+            input_values = (input_values - input_values.mean()) / torch.sqrt(
+                input_values.var(unbiased=False) + 1e-7
+            )
+        input_values = input_values.to(self.dtype)
+
+        last_hidden, layer4, layer11 = (h.squeeze(0) for h in self._forward(input_values))
+        # Variance/histogram need fp32; layers 4/11 stay in the model dtype
+        last_hidden = last_hidden.float()  # (T, 768)
 
-        # Layer divergence: cosine distance between layer 4 and layer 11
-        layer4 = outputs.hidden_states[4].float().squeeze(0)
-        layer11 = outputs.hidden_states[11].float().squeeze(0)
-        cos_sim = torch.nn.functional.cosine_similarity(layer4, layer11, dim=-1)
-        layer_divergence = (1.0 - cos_sim.mean()).item()
+        # Temporal variance: mean variance across time for each dimension
+        temporal_var = last_hidden.var(dim=0).mean()
+
+        # Embedding entropy: discretize hidden values and compute Shannon entropy.
+        # Histogram is built on-device (same 50 equal-width bins and density
+        # normalization as np.histogram) so the hidden states never leave the GPU.
+        n_bins = 50
+        lo, hi = last_hidden.aminmax()
+        bin_width = ((hi - lo) / n_bins).clamp_min(1e-12)
+        if last_hidden.is_cuda:
+            bin_idx = ((last_hidden - lo) / bin_width).long().clamp_(0, n_bins - 1)
+            counts = torch.bincount(bin_idx.flatten(), minlength=n_bins).float()
+        else:
+            # CPU: single fused pass, no index temporaries
+            counts = torch.from_numpy(fast_hist(
+                last_hidden.numpy().ravel(), n_bins, lo.item(), hi.item()
+            )).float()
+        hist = counts / (counts.sum() * bin_width)
+        entropy = -torch.where(
+            hist > 0, hist * torch.log2(hist + 1e-10), torch.zeros_like(hist)
+        ).sum()
+
+        # Layer divergence: cosine distance between layer 4 and layer 11.
+        # Products stay in half precision (layer-normed outputs), reductions
+        # accumulate in fp32, so no fp32 copy of either hidden state is made.
+        dot = (layer4 * layer11).sum(dim=-1, dtype=torch.float32)
+        norms = (torch.linalg.vector_norm(layer4, dim=-1, dtype=torch.float32)
+                 * torch.linalg.vector_norm(layer11, dim=-1, dtype=torch.float32))
+        cos_sim = dot / norms.clamp_min(1e-8)
+        layer_divergence = 1.0 - cos_sim.mean()
+
+        # Single device sync for the three statistics
+        temporal_var, entropy, layer_divergence = torch.stack(
+            [temporal_var, entropy, layer_divergence]
+        ).tolist()
 
         # Map features to AI score via sigmoids (calibrated on dataset)
         # Lower entropy → more AI (human ~2.03, ai ~1.88)
@@ -100,46 +312,88 @@ class WavLMAnalyzer:
 # Spectral Artifact Analyzer
 # ============================================================
 class SpectralArtifactAnalyzer:
-    """CPU-based spectral analysis to detect AI audio artifacts.
-    Checks for frequency cutoffs, spectral consistency, phase issues."""
+    """Spectral analysis to detect AI audio artifacts.
+    Checks for frequency cutoffs, spectral consistency, phase issues.
+    Runs one complex STFT on the given device and derives every feature
+    from it with tensor ops (mirrors the librosa feature definitions)."""
 
-    def analyze(self, audio_np: np.ndarray) -> dict:
-        # Spectral flatness
-        flatness = librosa.feature.spectral_flatness(y=audio_np)
-        flatness_mean = float(np.mean(flatness))
+    N_FFT = 2048
+    HOP_LENGTH = 512
+    ROLL_PERCENT = 0.85
+    HF_CUTOFF_HZ = 8000.0
+
+    def __init__(self, device: torch.device = torch.device("cpu")):
+        self.device = device
+        # power=None keeps the complex output so phase comes from the same pass;
+        # constant padding matches librosa.stft's default
+        self.spectrogram = torchaudio.transforms.Spectrogram(
+            n_fft=self.N_FFT, hop_length=self.HOP_LENGTH, power=None, pad_mode="constant",
+        ).to(device)
+        self.freqs = torch.linspace(
+            0, TARGET_SR / 2, self.N_FFT // 2 + 1, device=device
+        ).unsqueeze(1)  # (F, 1)
+        # First bin at/above the HF cutoff; n_fft and sr are fixed, so once
+        self.hf_idx = int(np.searchsorted(
+            np.linspace(0, TARGET_SR / 2, self.N_FFT // 2 + 1), self.HF_CUTOFF_HZ
+        ))
+
+    @torch.no_grad()
+    def analyze(self, audio) -> dict:
+        audio_t = torch.as_tensor(audio, dtype=torch.float32, device=self.device)
+
+        # Single complex STFT → magnitude (+ phase below)
+        stft = self.spectrogram(audio_t)  # (F, frames)
+        mag = stft.abs()
+        power = mag.square()
 
-        # STFT for multiple features
-        stft = np.abs(librosa.stft(audio_np, n_fft=2048, hop_length=512))
-        freqs = librosa.fft_frequencies(sr=TARGET_SR, n_fft=2048)
+        # Spectral flatness: geometric / arithmetic mean of the power spectrum
+        power_floor = power.clamp_min(1e-10)
+        flatness = torch.exp(torch.log(power_floor).mean(dim=0)) / power_floor.mean(dim=0)
 
         # High-frequency energy ratio (above 8kHz)
-        hf_boundary_idx = np.searchsorted(freqs, 8000)
-        total_energy = np.sum(stft ** 2)
-        hf_energy = np.sum(stft[hf_boundary_idx:, :] ** 2)
-        hf_ratio = float(hf_energy / (total_energy + 1e-10))
-
-        # Spectral bandwidth
-        bandwidth = librosa.feature.spectral_bandwidth(y=audio_np, sr=TARGET_SR)
-        bw_mean = float(np.mean(bandwidth))
-        bw_std = float(np.std(bandwidth))
-
-        # Spectral rolloff consistency
-        rolloff = librosa.feature.spectral_rolloff(y=audio_np, sr=TARGET_SR)
-        rolloff_std = float(np.std(rolloff))
-
-        # Phase continuity (2nd-order phase difference)
-        stft_complex = librosa.stft(audio_np, n_fft=2048, hop_length=512)
-        phase = np.angle(stft_complex)
-        if phase.shape[1] > 2:
-            phase_diff2 = np.diff(phase, n=2, axis=1)
-            phase_discontinuity = float(np.mean(np.abs(phase_diff2)))
+        total_energy = power.sum()
+        hf_energy = power[self.hf_idx:, :].sum()
+        hf_ratio = hf_energy / (total_energy + 1e-10)
+
+        # Spectral bandwidth (2nd-order deviation around the centroid)
+        mag_sum = mag.sum(dim=0, keepdim=True)  # per-frame total, shared with rolloff
+        mag_norm = mag / mag_sum.clamp_min(1e-10)
+        centroid = (self.freqs * mag_norm).sum(dim=0, keepdim=True)
+        bandwidth = torch.sqrt((mag_norm * (self.freqs - centroid) ** 2).sum(dim=0))
+
+        # Spectral rolloff consistency: first bin reaching 85% of the frame energy
+        cum_energy = torch.cumsum(mag, dim=0)
+        threshold = self.ROLL_PERCENT * mag_sum
+        rolloff_idx = torch.searchsorted(
+            cum_energy.T.contiguous(), threshold.T.contiguous()
+        ).squeeze(1).clamp_max(self.freqs.shape[0] - 1)
+        rolloff = self.freqs.squeeze(1)[rolloff_idx]
+
+        # Phase continuity (2nd-order phase difference), fp32 on-device;
+        # abs_ reuses the difference buffer instead of allocating another
+        if stft.shape[1] > 2:
+            phase_discontinuity = torch.diff(stft.angle(), n=2, dim=1).abs_().mean()
         else:
-            phase_discontinuity = 0.0
-
-        # Zero-crossing rate
-        zcr = librosa.feature.zero_crossing_rate(audio_np)
-        zcr_mean = float(np.mean(zcr))
-        zcr_std = float(np.std(zcr))
+            phase_discontinuity = torch.zeros((), device=self.device)
+
+        # Zero-crossing rate per frame (edge-padded, like librosa)
+        half = self.N_FFT // 2
+        padded = torch.nn.functional.pad(
+            audio_t.view(1, 1, -1), (half, half), mode="replicate"
+        ).view(-1)
+        frames = padded.unfold(0, self.N_FFT, self.HOP_LENGTH)
+        frames = torch.where(frames.abs() <= 1e-10, torch.zeros_like(frames), frames)
+        signs = torch.signbit(frames)
+        zcr = (signs[:, 1:] != signs[:, :-1]).sum(dim=1).float() / self.N_FFT
+
+        # Materialize all scalars with a single device sync
+        (flatness_mean, hf_ratio, bw_mean, bw_std, rolloff_std,
+         phase_discontinuity, zcr_mean, zcr_std) = torch.stack([
+            flatness.mean(), hf_ratio,
+            bandwidth.mean(), bandwidth.std(unbiased=False),
+            rolloff.std(unbiased=False), phase_discontinuity,
+            zcr.mean(), zcr.std(unbiased=False),
+        ]).tolist()
 
         # AI score from spectral features (calibrated on dataset)
         # Higher flatness → more AI (human ~0.047, ai ~0.119)
@@ -164,6 +418,134 @@ class SpectralArtifactAnalyzer:
         }
 
 
+# ============================================================
+# Histogram
+# ============================================================
+# Serial on purpose: analyze_all runs this while the parallel yin_f0 kernel
+# is live on an executor thread, and two parallel Numba regions at once abort
+# the process under the workqueue threading layer (no TBB/OpenMP installed).
+# A 50-bin pass over ~190k values doesn't need threads anyway.
+@njit(fastmath=True, cache=True, nogil=True)
+def fast_hist(x, n_bins, lo, hi):
+    """Equal-width histogram counts over a flat array in one pass (same bins
+    as np.histogram with range=(lo, hi))."""
+    counts = np.zeros(n_bins, dtype=np.int64)
+    scale = n_bins / (hi - lo) if hi > lo else 0.0
+    for i in range(x.shape[0]):
+        b = int((x[i] - lo) * scale)
+        if b >= n_bins:
+            b = n_bins - 1
+        elif b < 0:
+            b = 0
+        counts[b] += 1
+    return counts
+
+
+# ============================================================
+# YIN Pitch Tracker
+# ============================================================
+@njit(parallel=True, fastmath=True, cache=True, nogil=True)
+def yin_f0(audio, sr, fmin, fmax, frame_length=2048, hop_length=512, threshold=0.15):
+    """Frame-wise YIN F0 estimate (NaN for unvoiced frames).
+
+    Difference function → cumulative mean normalized difference → first
+    local minimum below `threshold` → parabolic refinement. Frames are
+    centered (zero-padded by frame_length // 2) like librosa.pyin, so the
+    frame grid and voiced ratio line up with the old pyin output."""
+    win_length = frame_length // 2
+    tau_min = max(1, int(sr / fmax))
+    tau_max = min(frame_length - win_length - 1, int(sr / fmin) + 1)
+
+    pad = frame_length // 2
+    padded = np.zeros(audio.shape[0] + 2 * pad)
+    padded[pad:pad + audio.shape[0]] = audio
+    n_frames = 1 + (padded.shape[0] - frame_length) // hop_length
+
+    f0 = np.full(n_frames, np.nan)
+    for t in prange(n_frames):
+        start = t * hop_length
+
+        # Difference function d(tau)
+        diff = np.zeros(tau_max + 1)
+        for tau in range(1, tau_max + 1):
+            acc = 0.0
+            for i in range(win_length):
+                delta = padded[start + i] - padded[start + i + tau]
+                acc += delta * delta
+            diff[tau] = acc
+
+        # Cumulative mean normalized difference d'(tau)
+        cmnd = np.ones(tau_max + 1)
+        running = 0.0
+        for tau in range(1, tau_max + 1):
+            running += diff[tau]
+            if running > 0.0:
+                cmnd[tau] = diff[tau] * tau / running
+
+        # First dip below threshold, walked down to its local minimum
+        best = -1
+        for tau in range(tau_min, tau_max):
+            if cmnd[tau] < threshold:
+                while tau + 1 < tau_max and cmnd[tau + 1] < cmnd[tau]:
+                    tau += 1
+                best = tau
+                break
+        if best < 0:
+            continue
+
+        # Parabolic interpolation around the minimum
+        shift = 0.0
+        a = cmnd[best - 1]
+        b = cmnd[best]
+        c = cmnd[best + 1]
+        denom = a - 2.0 * b + c
+        if denom != 0.0:
+            shift = 0.5 * (a - c) / denom
+            if shift > 1.0 or shift < -1.0:
+                shift = 0.0
+        f0[t] = sr / (best + shift)
+
+    return f0
+
+
+@njit(fastmath=True, cache=True)
+def prosody_stats(voiced_f0, rms):
+    """Single pass over the F0 and RMS contours.
+    Returns (jitter, shimmer, f0_range_semitones, f0_cv) with the same
+    definitions (population std, 1e-10 guards) as the original NumPy code."""
+    n = voiced_f0.shape[0]
+    f0_mean = 0.0
+    f0_m2 = 0.0
+    f0_abs_diff = 0.0
+    f0_min = voiced_f0[0]
+    f0_max = voiced_f0[0]
+    for i in range(n):
+        x = voiced_f0[i]
+        delta = x - f0_mean
+        f0_mean += delta / (i + 1)
+        f0_m2 += delta * (x - f0_mean)
+        if i > 0:
+            f0_abs_diff += abs(x - voiced_f0[i - 1])
+        if x < f0_min:
+            f0_min = x
+        if x > f0_max:
+            f0_max = x
+
+    m = rms.shape[0]
+    rms_sum = 0.0
+    rms_abs_diff = 0.0
+    for i in range(m):
+        rms_sum += rms[i]
+        if i > 0:
+            rms_abs_diff += abs(rms[i] - rms[i - 1])
+
+    jitter = (f0_abs_diff / (n - 1)) / (f0_mean + 1e-10)
+    shimmer = (rms_abs_diff / (m - 1)) / (rms_sum / m + 1e-10)
+    f0_range_st = 12.0 * np.log2((f0_max + 1e-10) / (f0_min + 1e-10))
+    f0_cv = np.sqrt(f0_m2 / n) / (f0_mean + 1e-10)
+    return jitter, shimmer, f0_range_st, f0_cv
+
+
 # ============================================================
 # Prosody Analyzer
 # ============================================================
@@ -171,14 +553,27 @@ class ProsodyAnalyzer:
     """CPU-based prosody analysis using pitch tracking.
     Measures jitter, shimmer, and other voice quality features."""
 
+    FMIN = 65.40639132514966     # C2
+    FMAX = 2093.004522404789     # C7
+    FRAME_LENGTH = 2048
+    HOP_LENGTH = 512
+
+    @classmethod
+    def _frame_rms(cls, audio: np.ndarray) -> np.ndarray:
+        """Per-frame RMS energy, equivalent to librosa.feature.rms with
+        center=True: zero-pad, strided frame view, one einsum reduction."""
+        padded = np.pad(audio, cls.FRAME_LENGTH // 2)
+        frames = np.lib.stride_tricks.sliding_window_view(
+            padded, cls.FRAME_LENGTH
+        )[::cls.HOP_LENGTH]
+        return np.sqrt(np.einsum("ij,ij->i", frames, frames) / cls.FRAME_LENGTH)
+
     def analyze(self, audio_np: np.ndarray) -> dict:
-        # Extract F0 with probabilistic YIN
-        f0, voiced_flag, voiced_prob = librosa.pyin(
-            audio_np,
-            fmin=librosa.note_to_hz('C2'),   # ~65 Hz
-            fmax=librosa.note_to_hz('C7'),   # ~2093 Hz
-            sr=TARGET_SR,
-        )
+        audio = np.asarray(audio_np, dtype=np.float64)
+
+        # Extract F0 with the JIT-compiled YIN tracker
+        f0 = yin_f0(audio, TARGET_SR, self.FMIN, self.FMAX,
+                    self.FRAME_LENGTH, self.HOP_LENGTH)
 
         voiced_f0 = f0[~np.isnan(f0)]
 
@@ -189,25 +584,14 @@ class ProsodyAnalyzer:
                 "ai_score": 0.5,
             }
 
-        # Jitter: relative average perturbation of consecutive F0 values
-        f0_diffs = np.abs(np.diff(voiced_f0))
-        jitter = float(np.mean(f0_diffs) / (np.mean(voiced_f0) + 1e-10))
-
-        # Shimmer: amplitude perturbation
-        rms = librosa.feature.rms(y=audio_np, frame_length=2048, hop_length=512)[0]
-        amp_diffs = np.abs(np.diff(rms))
-        shimmer = float(np.mean(amp_diffs) / (np.mean(rms) + 1e-10))
-
-        # F0 range in semitones
-        f0_min = np.min(voiced_f0)
-        f0_max = np.max(voiced_f0)
-        f0_range_st = float(12.0 * np.log2((f0_max + 1e-10) / (f0_min + 1e-10)))
+        rms = self._frame_rms(audio)
 
-        # F0 coefficient of variation
-        f0_cv = float(np.std(voiced_f0) / (np.mean(voiced_f0) + 1e-10))
+        # Jitter (relative F0 perturbation), shimmer (amplitude perturbation),
+        # F0 range in semitones and F0 coefficient of variation in one kernel
+        jitter, shimmer, f0_range_st, f0_cv = prosody_stats(voiced_f0, rms)
 
-        # Energy contour smoothness
-        energy_smoothness = float(np.mean(amp_diffs) / (np.mean(rms) + 1e-10))
+        # Energy contour smoothness (same formula as shimmer)
+        energy_smoothness = shimmer
 
         # Voiced segment ratio
         voiced_ratio = float(np.sum(~np.isnan(f0)) / len(f0))
@@ -233,40 +617,124 @@ class ProsodyAnalyzer:
         }
 
 
+# ============================================================
+# Multi-Signal Analyzer
+# ============================================================
+class MultiSignalAnalyzer:
+    """Runs the WavLM, spectral and prosody analyzers on one clip.
+    WavLM runs on its own CUDA stream while spectral and prosody run on
+    worker threads (yin_f0 releases the GIL), so latency is roughly the
+    slowest analyzer instead of the sum of all three."""
+
+    def __init__(self, device: torch.device, quantize_wavlm: bool = False,
+                 wavlm_onnx_path: str | None = None, wavlm_bf16: bool = False):
+        self.device = device
+        self.wavlm = WavLMAnalyzer(device, quantize=quantize_wavlm,
+                                   onnx_path=wavlm_onnx_path, bf16=wavlm_bf16)
+        self.spectral = SpectralArtifactAnalyzer(device)
+        self.prosody = ProsodyAnalyzer()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.stream = torch.cuda.Stream(device) if device.type == "cuda" else None
+
+    def analyze_all(self, audio_np: np.ndarray, audio_t: torch.Tensor | None = None) -> dict:
+        if audio_t is None:
+            audio_t = torch.from_numpy(audio_np).to(self.device)
+
+        spectral_future = self.executor.submit(self.spectral.analyze, audio_t)
+        prosody_future = self.executor.submit(self.prosody.analyze, audio_np)
+
+        if self.stream is not None:
+            self.stream.wait_stream(torch.cuda.current_stream(self.device))
+            with torch.cuda.stream(self.stream):
+                wavlm_result = self.wavlm.analyze(audio_t)
+            torch.cuda.current_stream(self.device).wait_stream(self.stream)
+        else:
+            wavlm_result = self.wavlm.analyze(audio_t)
+
+        return {
+            "wavlm": wavlm_result,
+            "spectral": spectral_future.result(),
+            "prosody": prosody_future.result(),
+        }
+
+
 # ============================================================
 # Ensemble Classifier
 # ============================================================
 class EnsembleClassifier:
     """Confidence-gated ensemble: wav2vec2 is primary, other signals
-    only influence borderline cases where wav2vec2 is uncertain."""
+    only influence borderline cases where wav2vec2 is uncertain.
 
+    When wav2vec2 is at least gate_margin away from 0.5 the supplementary
+    analyzers cannot change the label, so classify() skips them entirely."""
+
+    SIGNALS = ("wav2vec2", "wavlm", "spectral", "prosody")
     WEIGHTS = {
         "wav2vec2": 0.70,
         "wavlm": 0.12,
         "spectral": 0.10,
         "prosody": 0.08,
     }
+    _ROUNDED_WEIGHTS = {k: round(v, 4) for k, v in WEIGHTS.items()}
+
+    def __init__(self, gate_margin: float = 0.15):
+        self.gate_margin = gate_margin
+
+    def needs_supplementary(self, wav2vec2_ai_prob: float) -> bool:
+        return abs(wav2vec2_ai_prob - 0.5) < self.gate_margin
+
+    def classify(
+        self,
+        wav2vec2_ai_prob: float,
+        analyzer: "MultiSignalAnalyzer",
+        audio_np: np.ndarray,
+        audio_t: torch.Tensor | None = None,
+    ) -> dict:
+        """Run the WavLM/spectral/prosody analyzers only for uncertain clips."""
+        if not self.needs_supplementary(wav2vec2_ai_prob):
+            return self.combine(wav2vec2_ai_prob)
+        results = analyzer.analyze_all(audio_np, audio_t)
+        return self.combine(
+            wav2vec2_ai_prob, results["wavlm"], results["spectral"], results["prosody"]
+        )
 
     def combine(
         self,
         wav2vec2_ai_prob: float,
-        wavlm_result: dict,
-        spectral_result: dict,
-        prosody_result: dict,
+        wavlm_result: dict | None = None,
+        spectral_result: dict | None = None,
+        prosody_result: dict | None = None,
     ) -> dict:
-        scores = {
-            "wav2vec2": wav2vec2_ai_prob,
-            "wavlm": wavlm_result["ai_score"],
-            "spectral": spectral_result["ai_score"],
-            "prosody": prosody_result["ai_score"],
-        }
+        if wavlm_result is None or spectral_result is None or prosody_result is None:
+            # Gated out: wav2vec2 decides alone; the skipped signals stay in
+            # signal_scores as None so the response keeps the same keys
+            final_score = float(wav2vec2_ai_prob)
+            signal_scores = dict.fromkeys(self.SIGNALS)
+            signal_scores["wav2vec2"] = round(final_score, 4)
+            return {
+                "final_prediction": "ai" if final_score > 0.5 else "human",
+                "final_confidence": round(max(final_score, 1.0 - final_score), 4),
+                "ensemble_ai_score": round(final_score, 4),
+                "signal_scores": signal_scores,
+                "signal_weights": dict(self._ROUNDED_WEIGHTS),
+                "signal_agreement": 1.0,
+                "supplementary_skipped": True,
+            }
+
+        # Scores in SIGNALS order: wav2vec2 first, then the 3 supplementary signals
+        scores = np.array([
+            wav2vec2_ai_prob,
+            wavlm_result["ai_score"],
+            spectral_result["ai_score"],
+            prosody_result["ai_score"],
+        ], dtype=np.float64)
+        ai_mask = scores > 0.5
 
         # wav2vec2 is the trained primary signal — start with its decision
-        w2v_pred_ai = wav2vec2_ai_prob > 0.5
+        w2v_pred_ai = bool(ai_mask[0])
 
         # Count how many supplementary signals agree with wav2vec2
-        supp_scores = [scores["wavlm"], scores["spectral"], scores["prosody"]]
-        supp_ai_votes = sum(1 for s in supp_scores if s > 0.5)
+        supp_ai_votes = int(ai_mask[1:].sum())
 
         # Ensemble strategy: wav2vec2 decision stands, supplementary signals
         # adjust confidence. Override only when ALL 3 supplementary signals
@@ -293,14 +761,15 @@ class EnsembleClassifier:
         final_confidence = max(final_score, 1.0 - final_score)
 
         # Agreement ratio
-        ai_votes = sum(1 for s in scores.values() if s > 0.5)
+        ai_votes = int(ai_mask.sum())
         agreement_ratio = max(ai_votes, 4 - ai_votes) / 4.0
 
         return {
             "final_prediction": final_label,
             "final_confidence": round(float(final_confidence), 4),
             "ensemble_ai_score": round(float(final_score), 4),
-            "signal_scores": {k: round(v, 4) for k, v in scores.items()},
-            "signal_weights": {k: round(v, 4) for k, v in self.WEIGHTS.items()},
+            "signal_scores": dict(zip(self.SIGNALS, np.round(scores, 4).tolist())),
+            "signal_weights": dict(self._ROUNDED_WEIGHTS),
             "signal_agreement": round(float(agreement_ratio), 2),
+            "supplementary_skipped": False,
         }
@@ -27,7 +27,7 @@ async def lifespan(app: FastAPI):
     global model, feature_extractor, device
 
     print("Loading wav2vec2 model...")
-    model, feature_extractor, device = load_model()
+    model, feature_extractor, device = load_model(warmup_rows=(1,))  # predict() only
     print(f"wav2vec2 loaded on {device}")
 
     yield
@@ -0,0 +1,63 @@
+"""
+ONNX Export for AI Voice Detector
+Exports the fine-tuned wav2vec2 classifier to ONNX so inference.py can run it
+through ONNX Runtime (mainly a CPU / edge speedup).
+"""
+
+import sys
+from pathlib import Path
+
+import torch
+from transformers import Wav2Vec2ForSequenceClassification
+
+from inference import MODEL_DIR, MAX_LENGTH, ONNX_FILENAME
+
+
+class _Logits(torch.nn.Module):
+    """ONNX export wrapper: input_values in, logits out."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_values):
+        return self.model(input_values=input_values, return_dict=False)[0]
+
+
+def export(model_dir=MODEL_DIR):
+    """Export `model_dir` to `model_dir/model.onnx` and return the path."""
+    model_dir = Path(model_dir)
+    onnx_path = model_dir / ONNX_FILENAME
+
+    # Default (eager) attention traces to plain MatMul/Softmax nodes
+    model = Wav2Vec2ForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    # Time axis fixed at MAX_LENGTH (inference always pads to it); only the
+    # batch axis is dynamic so predict_batch can send several rows
+    dummy = torch.zeros(1, MAX_LENGTH)
+    batch_axis = {0: "batch"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _Logits(model), (dummy,), str(onnx_path),
+            input_names=["input_values"],
+            output_names=["logits"],
+            dynamic_axes={"input_values": batch_axis, "logits": batch_axis},
+            opset_version=17,
+        )
+    return onnx_path
+
+
+def main():
+    model_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else MODEL_DIR
+    if not model_dir.exists():
+        print(f"[!] Model not found: {model_dir} (run train.py first)")
+        sys.exit(1)
+
+    print(f"[*] Exporting {model_dir} to ONNX...")
+    onnx_path = export(model_dir)
+    print(f"[*] Saved {onnx_path} ({onnx_path.stat().st_size / 1024**2:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
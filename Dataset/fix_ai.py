@@ -1,21 +1,22 @@
-"""Fill missing AI English samples using torchaudio for mp3 loading instead of librosa."""
+"""Fill missing AI English samples, decoding mp3 in-process with soundfile instead of librosa."""
 
 import os
 import asyncio
 import random
 import tempfile
-import csv
 from pathlib import Path
 
 import edge_tts
-import torchaudio
-import torch
 import soundfile as sf
+import soxr
 import numpy as np
+import pandas as pd
 from tqdm import tqdm
 
 BASE_DIR = Path(__file__).parent / "dataset"
 TARGET_SR = 16000
+TTS_CONCURRENCY = 8  # edge-tts requests in flight at once
+MAX_RETRIES = 3
 
 ENGLISH_VOICES = [
     "en-US-GuyNeural", "en-US-JennyNeural", "en-US-AriaNeural",
@@ -52,120 +53,128 @@ SENTENCES = [
 ]
 
 
-async def generate_one(text, voice, output_path):
-    """Generate TTS and convert to wav using torchaudio."""
+def _wav_names(directory, prefix=""):
+    """Sorted WAV file names in `directory` from a single os.scandir pass
+    (no Path objects, no per-entry stat); [] if the directory is missing."""
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(e.name for e in entries if e.name.startswith(prefix) and e.name.endswith(".wav"))
+    except FileNotFoundError:
+        return []
+
+
+async def generate_one(text, voice, output_path, tmp_dir):
+    """Generate TTS and convert to wav using soundfile + soxr.
+    The MP3 goes to a per-sample path in tmp_dir; retries overwrite it and
+    the directory is removed as a whole when generation finishes."""
+    split = output_path.parent.parent.name  # stems repeat across train/test
+    tmp_path = str(Path(tmp_dir) / f"{split}_{output_path.stem}.mp3")
     try:
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-            tmp_path = tmp.name
-
         communicate = edge_tts.Communicate(text, voice)
         await communicate.save(tmp_path)
 
-        # Use torchaudio instead of librosa for better mp3 support
-        waveform, sr = torchaudio.load(tmp_path)
+        # libsndfile decodes mp3 in-process (no audioread/ffmpeg subprocess)
+        audio, sr = sf.read(tmp_path, dtype="float32")
 
         # Mono
-        if waveform.shape[0] > 1:
-            waveform = waveform.mean(dim=0, keepdim=True)
-        waveform = waveform.squeeze(0)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
 
         # Resample
         if sr != TARGET_SR:
-            resampler = torchaudio.transforms.Resample(sr, TARGET_SR)
-            waveform = resampler(waveform)
+            audio = soxr.resample(audio, sr, TARGET_SR, quality="HQ")
 
-        audio = waveform.numpy().astype(np.float32)
-        if np.max(np.abs(audio)) > 0:
-            audio = audio / np.max(np.abs(audio)) * 0.95
+        peak = max(audio.max(), -audio.min()) if audio.size else 0
+        if peak > 0:
+            audio *= 0.95 / peak
 
         sf.write(str(output_path), audio, TARGET_SR)
-        os.unlink(tmp_path)
         return True
     except Exception as e:
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
         return False
 
 
+async def generate_with_retries(text, voices, output_path, tmp_dir, sem):
+    """Try each pre-drawn voice in turn (up to MAX_RETRIES), holding one
+    of the semaphore's slots for the whole sample."""
+    async with sem:
+        for voice in voices:
+            if await generate_one(text, voice, output_path, tmp_dir):
+                return True
+    return False
+
+
 async def main():
     random.seed(77)
+    sem = asyncio.Semaphore(TTS_CONCURRENCY)
 
-    for split in ["train", "test"]:
-        ai_dir = BASE_DIR / split / "ai"
-        existing_en = sorted(ai_dir.glob("ai_en_*.wav"))
-        existing_count = len(existing_en)
-        needed = 25 - existing_count
-
-        if needed <= 0:
-            print(f"[{split}] Already have {existing_count} English AI - OK")
-            continue
-
-        print(f"[{split}] Have {existing_count}/25 English AI, generating {needed} more...")
-
-        # Find which indices are missing
-        existing_indices = set()
-        for f in existing_en:
-            idx = int(f.stem.split("_")[-1])
-            existing_indices.add(idx)
-
-        generated = 0
-        attempt = 0
-        random.shuffle(SENTENCES)
-        sent_idx = 0
-
-        for idx in range(25):
-            if idx in existing_indices:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for split in ["train", "test"]:
+            ai_dir = BASE_DIR / split / "ai"
+            existing_en = _wav_names(ai_dir, "ai_en_")
+            existing_count = len(existing_en)
+            needed = 25 - existing_count
+
+            if needed <= 0:
+                print(f"[{split}] Already have {existing_count} English AI - OK")
                 continue
 
-            text = SENTENCES[sent_idx % len(SENTENCES)]
-            sent_idx += 1
-            voice = random.choice(ENGLISH_VOICES)
-            output_path = ai_dir / f"ai_en_{idx:04d}.wav"
+            print(f"[{split}] Have {existing_count}/25 English AI, generating {needed} more...")
 
-            # Try up to 3 times
-            for retry in range(3):
-                success = await generate_one(text, voice, output_path)
-                if success:
-                    generated += 1
-                    break
-                voice = random.choice(ENGLISH_VOICES)
+            # Find which indices are missing: ai_en_{idx:04d}.wav
+            existing_indices = {int(name[len("ai_en_"):-len(".wav")]) for name in existing_en}
 
-        print(f"  Generated {generated}/{needed} missing samples")
+            random.shuffle(SENTENCES)
+            sent_idx = 0
+
+            # Texts and retry voices are drawn up front so the random stream
+            # doesn't depend on completion order; the requests run concurrently
+            tasks = []
+            for idx in range(25):
+                if idx in existing_indices:
+                    continue
+
+                text = SENTENCES[sent_idx % len(SENTENCES)]
+                sent_idx += 1
+                voices = [random.choice(ENGLISH_VOICES) for _ in range(MAX_RETRIES)]
+                output_path = ai_dir / f"ai_en_{idx:04d}.wav"
+                tasks.append(generate_with_retries(text, voices, output_path, tmp_dir, sem))
+
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            generated = sum(r is True for r in results)
+
+            print(f"  Generated {generated}/{needed} missing samples")
 
     # Rebuild metadata
     print("\nRebuilding metadata...")
     metadata_file = BASE_DIR / "metadata.csv"
-    rows = []
 
+    # One frame per directory listing; every other column is derived column-wise
+    df = pd.concat([
+        pd.DataFrame({
+            "file_name": _wav_names(BASE_DIR / split / cls),
+            "label_name": cls,
+            "split": split,
+        })
+        for split in ["train", "test"]
+        for cls in ["human", "ai"]
+    ], ignore_index=True)
+    df["file_path"] = str(BASE_DIR) + os.sep + df["split"] + os.sep + df["label_name"] + os.sep + df["file_name"]
+    df["label"] = (df["label_name"] == "ai").astype(int)
+    df["language"] = np.where(df["file_name"].str.contains("_en_", regex=False), "en", "hi")
+
+    df.to_csv(
+        metadata_file, index=False, encoding="utf-8",
+        columns=["file_path", "file_name", "label", "label_name", "language", "split"],
+    )
+
+    counts = df.groupby(["split", "label"]).size()
     for split in ["train", "test"]:
-        split_dir = BASE_DIR / split
-        for cls in ["human", "ai"]:
-            for f in sorted((split_dir / cls).glob("*.wav")):
-                lang = "en" if "_en_" in f.name else "hi"
-                rows.append({
-                    "file_path": str(f),
-                    "file_name": f.name,
-                    "label": 0 if cls == "human" else 1,
-                    "label_name": cls,
-                    "language": lang,
-                    "split": split,
-                })
-
-    with open(metadata_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["file_path", "file_name", "label", "label_name", "language", "split"])
-        writer.writeheader()
-        writer.writerows(rows)
-
-    total = len(rows)
-    for split in ["train", "test"]:
-        s = [r for r in rows if r["split"] == split]
-        h = sum(1 for r in s if r["label"] == 0)
-        a = sum(1 for r in s if r["label"] == 1)
-        print(f"  [{split.upper()}] Human: {h} | AI: {a} | Total: {len(s)}")
+        h = counts.get((split, 0), 0)
+        a = counts.get((split, 1), 0)
+        print(f"  [{split.upper()}] Human: {h} | AI: {a} | Total: {h + a}")
 
-    print(f"\nTotal: {total} files")
+    print(f"\nTotal: {len(df)} files")
 
 
 if __name__ == "__main__":
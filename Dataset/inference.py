@@ -4,29 +4,126 @@ Load the fine-tuned wav2vec2 model and classify audio as Human or AI.
 """
 
 import sys
+import functools
+from types import SimpleNamespace
 import torch
 import torchaudio
-import numpy as np
 from pathlib import Path
-from transformers import Wav2Vec2ForSequenceClassification, Wav2Vec2FeatureExtractor
+from transformers import Wav2Vec2Config, Wav2Vec2ForSequenceClassification, Wav2Vec2FeatureExtractor
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
 
 MODEL_DIR = Path(__file__).parent / "model_output" / "best_model"
 TARGET_SR = 16000
 MAX_DURATION_SEC = 5
 MAX_LENGTH = TARGET_SR * MAX_DURATION_SEC
-
-
-def load_model(model_dir=MODEL_DIR):
-    """Load the fine-tuned model and feature extractor."""
+COMPILE_MODEL = True  # every input is padded to MAX_LENGTH, so one graph serves all
+QUANTIZE_ON_CPU = True  # int8 dynamic quantization of Linear layers, CPU only
+ONNX_FILENAME = "model.onnx"  # written into the model dir by export_onnx.py
+BATCH_SIZE = 8  # files per forward pass in predict_batch
+
+
+@functools.lru_cache(maxsize=None)
+def _get_resampler(orig_sr):
+    """Resample kernels are built once per source rate and reused."""
+    return torchaudio.transforms.Resample(orig_sr, TARGET_SR)
+
+
+@functools.lru_cache(maxsize=None)
+def _input_buffer(device, rows=1):
+    """One fixed-shape (rows, MAX_LENGTH) input per device, refilled on every call."""
+    return torch.zeros(rows, MAX_LENGTH, device=device)
+
+
+def load_wav2vec2(name_or_path, **kwargs):
+    """Load the classifier with fused SDPA attention, falling back to the eager
+    attention path on transformers versions where wav2vec2 lacks SDPA."""
+    try:
+        return Wav2Vec2ForSequenceClassification.from_pretrained(
+            name_or_path, attn_implementation="sdpa", **kwargs
+        )
+    except (ValueError, ImportError) as e:
+        print(f"[!] SDPA attention unavailable for wav2vec2 ({e}); using default attention")
+        return Wav2Vec2ForSequenceClassification.from_pretrained(name_or_path, **kwargs)
+
+
+class OnnxClassifier:
+    """ONNX Runtime session exposing the `model(input_values=...).logits` and
+    `model.config` surface that predict_batch uses."""
+
+    def __init__(self, onnx_path, model_dir, device):
+        providers = ["CPUExecutionProvider"]
+        if device.type == "cuda":
+            providers.insert(0, ("CUDAExecutionProvider", {"device_id": device.index or 0}))
+        self.session = ort.InferenceSession(str(onnx_path), providers=providers)
+        self.config = Wav2Vec2Config.from_pretrained(model_dir)
+        self.device = device
+
+    def __call__(self, input_values):
+        logits = self.session.run(["logits"], {"input_values": input_values.cpu().numpy()})[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits).to(self.device))
+
+
+def _load_onnx(model_dir, device):
+    """OnnxClassifier for an up-to-date export in `model_dir`, else None."""
+    model_dir = Path(model_dir)
+    onnx_path = model_dir / ONNX_FILENAME
+    if ort is None or not onnx_path.exists():
+        return None
+    # save_pretrained rewrites config.json, so an older export is stale
+    if onnx_path.stat().st_mtime < (model_dir / "config.json").stat().st_mtime:
+        print(f"[!] {onnx_path} is older than the checkpoint; re-run export_onnx.py")
+        return None
+    return OnnxClassifier(onnx_path, model_dir, device)
+
+
+def load_model(model_dir=MODEL_DIR, compile_model=COMPILE_MODEL, quantize=QUANTIZE_ON_CPU,
+               warmup_rows=(1, BATCH_SIZE)):
+    """Load the fine-tuned model and feature extractor. Uses the ONNX Runtime
+    export from export_onnx.py when present and onnxruntime is installed;
+    otherwise the PyTorch model, int8-quantized when running on CPU.
+    A compiled model is warmed up at each batch size in `warmup_rows`."""
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained(model_dir)
-    model = Wav2Vec2ForSequenceClassification.from_pretrained(model_dir).to(device)
+
+    # Inputs are always (rows, MAX_LENGTH): autotune convs once, TF32 matmuls
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision("high")
+
+    model = _load_onnx(model_dir, device)
+    if model is not None:
+        return model, feature_extractor, device
+
+    model = load_wav2vec2(model_dir).to(device)
     model.eval()
+
+    if quantize and device.type == "cpu":
+        engines = torch.backends.quantized.supported_engines
+        torch.backends.quantized.engine = "fbgemm" if "fbgemm" in engines else "qnnpack"
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        compile_model = False  # Inductor doesn't lower the dynamic-quantized Linear ops
+
+    if compile_model:
+        model = torch.compile(model, mode="reduce-overhead", dynamic=False)
+        # Warm up every batch shape the caller will send (predict: 1 row,
+        # predict_batch: BATCH_SIZE rows) so neither compilation nor CUDA graph
+        # capture lands on a real request. Same grad mode as predict_batch.
+        with torch.inference_mode():
+            for rows in warmup_rows:
+                model(input_values=_input_buffer(device, rows))
+
     return model, feature_extractor, device
 
 
-def predict(audio_path, model, feature_extractor, device):
-    """Predict whether an audio file is Human or AI generated."""
+def load_clip(audio_path):
+    """Decode to a mono 1-D float tensor at TARGET_SR."""
     waveform, sr = torchaudio.load(audio_path)
 
     # Mono
@@ -36,36 +133,51 @@ def predict(audio_path, model, feature_extractor, device):
 
     # Resample
     if sr != TARGET_SR:
-        resampler = torchaudio.transforms.Resample(sr, TARGET_SR)
-        waveform = resampler(waveform)
-
-    # Truncate / pad
-    if waveform.shape[0] > MAX_LENGTH:
-        waveform = waveform[:MAX_LENGTH]
-    elif waveform.shape[0] < MAX_LENGTH:
-        padding = MAX_LENGTH - waveform.shape[0]
-        waveform = torch.nn.functional.pad(waveform, (0, padding))
-
-    # Normalize
-    waveform = waveform.numpy()
-    if np.max(np.abs(waveform)) > 0:
-        waveform = waveform / np.max(np.abs(waveform))
-
-    # Feature extraction
-    inputs = feature_extractor(
-        waveform, sampling_rate=TARGET_SR, return_tensors="pt", padding=False
-    )
-    input_values = inputs.input_values.to(device)
-
-    # Inference
-    with torch.no_grad():
-        outputs = model(input_values=input_values)
-        probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        pred_id = torch.argmax(probs, dim=-1).item()
-        confidence = probs[0][pred_id].item()
-
-    label = model.config.id2label[pred_id]
-    return label, confidence, probs[0].cpu().numpy()
+        waveform = _get_resampler(sr)(waveform)
+    return waveform
+
+
+def predict_batch(audio_paths, model, feature_extractor, device, batch_size=BATCH_SIZE):
+    """Classify several audio files, one forward pass per `batch_size` files.
+    Returns a (label, confidence, probs) tuple per path, in order."""
+    input_values = _input_buffer(device, batch_size)
+    results = []
+
+    for i in range(0, len(audio_paths), batch_size):
+        chunk = audio_paths[i:i + batch_size]
+
+        # Truncate / pad each clip straight into its row of the reused buffer;
+        # spare rows of a short last chunk are silenced so the shape never changes
+        for row, audio_path in enumerate(chunk):
+            waveform = load_clip(audio_path)
+            n = min(waveform.shape[0], MAX_LENGTH)
+            input_values[row, :n].copy_(waveform[:n])
+            input_values[row, n:].zero_()
+        input_values[len(chunk):].zero_()
+
+        # Normalize each row (in place, single reduction)
+        input_values.div_(input_values.abs().amax(dim=-1, keepdim=True).clamp_min_(1e-8))
+
+        # Feature extraction: the extractor's zero-mean / unit-variance step, inline
+        if feature_extractor.do_normalize:
+            var, mean = torch.var_mean(input_values, dim=-1, keepdim=True, correction=0)
+            input_values.sub_(mean).div_(var.add_(1e-7).sqrt_())
+
+        # Inference
+        with torch.inference_mode():
+            outputs = model(input_values=input_values)
+            probs = torch.nn.functional.softmax(outputs.logits[:len(chunk)], dim=-1)
+            confidences, pred_ids = probs.max(dim=-1)
+
+        for pred_id, confidence, row_probs in zip(pred_ids.tolist(), confidences.tolist(), probs.cpu().numpy()):
+            results.append((model.config.id2label[pred_id], confidence, row_probs))
+
+    return results
+
+
+def predict(audio_path, model, feature_extractor, device):
+    """Predict whether an audio file is Human or AI generated."""
+    return predict_batch([audio_path], model, feature_extractor, device, batch_size=1)[0]
 
 
 def main():
@@ -90,15 +202,19 @@ def main():
     else:
         audio_paths = sys.argv[1:]
 
-    correct = 0
-    total = 0
+    found = []
     for audio_path in audio_paths:
-        path = Path(audio_path)
-        if not path.exists():
+        if Path(audio_path).exists():
+            found.append(audio_path)
+        else:
             print(f"[!] File not found: {audio_path}")
-            continue
 
-        label, confidence, probs = predict(audio_path, model, feature_extractor, device)
+    results = predict_batch(found, model, feature_extractor, device)
+
+    correct = 0
+    total = 0
+    for audio_path, (label, confidence, probs) in zip(found, results):
+        path = Path(audio_path)
 
         # Determine ground truth from path if available
         ground_truth = ""
@@ -16,9 +16,19 @@ Live Dashboard:
 import audioop
 import base64
 import io
+import json
 import logging
 import os
+import re
+import struct
+import subprocess
+import threading
 import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
 
 from dotenv import load_dotenv
 
@@ -26,21 +36,28 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from flask import Flask, Response, jsonify, render_template, request, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_sock import Sock
 from flask_socketio import SocketIO, emit, join_room
 
+import dashboard_events
 from conversation import ConversationManager, GREETING_TEXT
 from database import (
     create_call, delete_call, end_call as db_end_call, get_active_calls,
-    get_call, get_call_history, get_call_intel, get_call_transcript,
-    get_stats, get_total_calls, init_db, save_intel, save_message,
+    get_call, get_call_history, get_call_intel, get_call_report, get_call_transcript,
+    get_stats, get_total_calls, init_db, save_call_report, save_intel, save_message,
 )
-from intel_extractor import extract_intel
-from llm_service import chat_completion
-from speech_service import speech_to_text, text_to_speech, get_provider_info
-from twilio_stream import TwilioStreamHandler
+from intel_extractor import DASHBOARD_INTEL_FIELDS, extract_intel
+from llm_service import chat_completion, chat_completion_streaming
+from speech_service import speech_to_text, tts_cached, get_provider_info
+from twilio_stream import TwilioStreamHandler, encode_playback_frames
 from voice_classifier import classify_audio, is_classifier_healthy
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
 )
@@ -52,11 +69,60 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "karma-ai-secret-key")
 
+
+def _orjson_default(obj):
+    """Types orjson doesn't handle natively (it already covers datetime/uuid)."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class _OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson; jsonify() goes through it."""
+
+    def dumps(self, obj, **_kwargs) -> str:
+        return _orjson_dumps(obj).decode()
+
+    def loads(self, s, **_kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(_orjson_dumps(obj), mimetype="application/json")
+
+
+if orjson is not None:
+    app.json = _OrjsonProvider(app)
+
+
+class _OrjsonCodec:
+    """json-module shim for python-socketio packets backed by orjson.
+
+    Packet encoders pass stdlib kwargs (e.g. separators=); orjson output is
+    already compact, so they are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj, **_kwargs) -> str:
+        return _orjson_dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, **_kwargs):
+        return orjson.loads(s)
+
+
+_socketio_options = {"json": _OrjsonCodec} if orjson is not None else {}
+
 socketio = SocketIO(
     app,
     cors_allowed_origins="*",
     max_http_buffer_size=10 * 1024 * 1024,  # 10 MB for audio blobs
     async_mode="threading",
+    **_socketio_options,
 )
 
 sock = Sock(app)
@@ -65,8 +131,23 @@ MODE = os.getenv("MODE", "both").lower().strip()
 
 conversation_mgr = ConversationManager()
 
-# Mute state per call
-mute_state: dict[str, bool] = {}
+
+@dataclass(slots=True)
+class CallSession:
+    """Per-call state for web sessions and Twilio calls, keyed by call/session id."""
+    muted: bool = False
+    classification: str | None = None  # web only: "pending" → "ai" | "human"
+
+
+sessions: dict[str, CallSession] = {}
+
+
+def get_session(call_sid: str) -> CallSession:
+    session = sessions.get(call_sid)
+    if session is None:
+        session = sessions[call_sid] = CallSession()
+    return session
+
 
 RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), "recordings")
 os.makedirs(RECORDINGS_DIR, exist_ok=True)
@@ -80,9 +161,7 @@ init_db()
 
 # AI/Human classification: text announced when caller is detected as AI
 AI_DETECTED_TEXT = "Caller is classified as AI."
-
-# Track which web sessions have been classified already
-classified_sessions: dict[str, str] = {}  # session_id → "ai" | "human"
+_AI_DETECTED_TRANSCRIPT = {"text": AI_DETECTED_TEXT, "role": "system"}
 
 # Pre-cache greeting TTS audio at startup (saves ~1s on first call)
 _cached_greeting_twilio: bytes | None = None   # 8kHz WAV for legacy/audio endpoint
@@ -91,8 +170,24 @@ _cached_greeting_mulaw: bytes | None = None    # raw mulaw 8kHz for Twilio Media
 _cached_ai_detected_web: bytes | None = None   # 22050Hz WAV "Caller is classified as AI"
 _cached_ai_detected_mulaw: bytes | None = None # raw mulaw 8kHz for Twilio
 
+# Twilio media payloads (base64 mulaw chunks), split and encoded once
+_cached_greeting_frames: tuple[str, ...] = ()
+_cached_ai_detected_frames: tuple[str, ...] = ()
+
+# Full "audio_response" payload for the AI-detected announcement
+_cached_ai_detected_web_payload: dict | None = None
+
+
+def _ai_detected_payload(wav_bytes: bytes) -> dict:
+    """"audio_response" event body for the AI-detected announcement."""
+    return {
+        "audio": wav_bytes,
+        "text": AI_DETECTED_TEXT,
+        "type": "ai_detected",
+    }
+
 
-def _wav_to_mulaw(wav_bytes: bytes) -> bytes:
+def _wav_to_mulaw_safe(wav_bytes: bytes) -> bytes:
     """Extract PCM from a WAV file and convert to raw mulaw bytes."""
     buf = io.BytesIO(wav_bytes)
     with wave.open(buf, "rb") as wf:
@@ -100,21 +195,41 @@ def _wav_to_mulaw(wav_bytes: bytes) -> bytes:
     return audioop.lin2ulaw(pcm_data, 2)
 
 
+def _wav_to_mulaw_fast(wav_bytes: bytes) -> bytes:
+    """Like _wav_to_mulaw_safe, but slices the PCM straight out of a canonical
+    44-byte header (mono PCM16, data chunk right after fmt). Anything else
+    falls back to the wave-based parser."""
+    if (
+        len(wav_bytes) >= 44
+        and wav_bytes[:4] == b"RIFF"
+        and wav_bytes[8:16] == b"WAVEfmt "
+        and wav_bytes[36:40] == b"data"
+        and struct.unpack_from("<HH", wav_bytes, 20) == (1, 1)  # PCM, mono
+        and struct.unpack_from("<H", wav_bytes, 34)[0] == 16
+    ):
+        data_len = struct.unpack_from("<I", wav_bytes, 40)[0]
+        return audioop.lin2ulaw(wav_bytes[44:44 + data_len], 2)
+    return _wav_to_mulaw_safe(wav_bytes)
+
+
 def _precache_greetings():
     global _cached_greeting_twilio, _cached_greeting_web, _cached_greeting_mulaw
     global _cached_ai_detected_web, _cached_ai_detected_mulaw
+    global _cached_greeting_frames, _cached_ai_detected_frames
+    global _cached_ai_detected_web_payload
     try:
         logger.info("Pre-caching greeting TTS audio...")
-        _cached_greeting_twilio = text_to_speech(
+        _cached_greeting_twilio = tts_cached(
             text=GREETING_TEXT, language_code="hi-IN", speaker="kavya", sample_rate="8000",
         )
-        _cached_greeting_web = text_to_speech(
+        _cached_greeting_web = tts_cached(
             text=GREETING_TEXT, language_code="hi-IN", speaker="kavya", sample_rate="22050",
         )
 
         # Convert 8kHz WAV greeting to raw mulaw for Media Streams
         if _cached_greeting_twilio:
-            _cached_greeting_mulaw = _wav_to_mulaw(_cached_greeting_twilio)
+            _cached_greeting_mulaw = _wav_to_mulaw_fast(_cached_greeting_twilio)
+            _cached_greeting_frames = encode_playback_frames(_cached_greeting_mulaw)
             logger.info(
                 "Greeting audio cached (twilio=%d, web=%d, mulaw=%d bytes)",
                 len(_cached_greeting_twilio),
@@ -133,133 +248,219 @@ def _precache_greetings():
     # Pre-cache "Caller is classified as AI" announcement
     try:
         logger.info("Pre-caching AI-detected announcement audio...")
-        ai_det_twilio = text_to_speech(
+        ai_det_twilio = tts_cached(
             text=AI_DETECTED_TEXT, language_code="en-IN", speaker="kavya", sample_rate="8000",
         )
-        _cached_ai_detected_web = text_to_speech(
+        _cached_ai_detected_web = tts_cached(
             text=AI_DETECTED_TEXT, language_code="en-IN", speaker="kavya", sample_rate="22050",
         )
+        if _cached_ai_detected_web:
+            _cached_ai_detected_web_payload = _ai_detected_payload(_cached_ai_detected_web)
         if ai_det_twilio:
-            _cached_ai_detected_mulaw = _wav_to_mulaw(ai_det_twilio)
+            _cached_ai_detected_mulaw = _wav_to_mulaw_fast(ai_det_twilio)
+            _cached_ai_detected_frames = encode_playback_frames(_cached_ai_detected_mulaw)
             logger.info("AI-detected announcement cached (mulaw=%d, web=%d bytes)",
                         len(_cached_ai_detected_mulaw), len(_cached_ai_detected_web or b""))
     except Exception as e:
         logger.warning("Failed to pre-cache AI-detected audio: %s", e)
 
 
+def _warmup():
+    """Exercise the LLM, STT and classifier once so HTTP sessions, lazy
+    provider imports and the classifier model are hot before the first call."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(b"\x00" * 6400)  # 0.2 s of silence
+    silence_wav = buf.getvalue()
+
+    steps = (
+        ("LLM", lambda: chat_completion([{"role": "user", "content": "Reply with OK."}])),
+        ("STT", lambda: speech_to_text(silence_wav, language_code="hi-IN")),
+        ("classifier", lambda: classify_audio(silence_wav, timeout=10.0)),
+    )
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            logger.warning("Warm-up %s failed: %s", name, e)
+    logger.info("Warm-up complete")
+
+
 _precache_greetings()
 
+# Off the startup path; set WARMUP=0 to skip the (billed) warm-up requests
+if os.getenv("WARMUP", "1") != "0":
+    threading.Thread(target=_warmup, name="karma-warmup", daemon=True).start()
+
 
 # ---------------------------------------------------------------------------
 # Dashboard helpers — broadcast to all dashboard viewers
 # ---------------------------------------------------------------------------
+
+# Connected dashboard viewers; broadcasts are skipped entirely while it is 0
+_dashboard_clients = 0
+_dashboard_lock = threading.Lock()
+
+
+def _dashboard_joined(delta: int):
+    global _dashboard_clients
+    with _dashboard_lock:
+        _dashboard_clients = max(0, _dashboard_clients + delta)
+
+
+def _now_iso() -> str:
+    """UTC timestamp for dashboard events."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _broadcast(event: str, payload: dict):
+    """Emit to the dashboard room, or queue it if a batch is open."""
+    if _dashboard_clients == 0:
+        return
+    dashboard_events.emit(socketio, event, payload)
+
+
+def batched_broadcasts():
+    """Collect dashboard broadcasts in this block into a single emit."""
+    return dashboard_events.batched(socketio)
+
+
 def broadcast_call_started(call_sid: str, caller: str = "Unknown"):
     """Notify dashboard that a new call started."""
-    from datetime import datetime, timezone
-    socketio.emit("call_started", {
+    _broadcast("call_started", {
         "call_sid": call_sid,
         "caller": caller,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }, room="dashboard")
+        "timestamp": _now_iso(),
+    })
 
 
 def broadcast_call_ended(call_sid: str, duration: int = 0):
     """Notify dashboard that a call ended."""
-    socketio.emit("call_ended", {
+    _broadcast("call_ended", {
         "call_sid": call_sid,
         "duration": duration,
-    }, room="dashboard")
+    })
 
 
 def broadcast_transcript(call_sid: str, speaker: str, text: str):
     """Send a transcript message to the dashboard."""
-    from datetime import datetime, timezone
-    socketio.emit("transcript_message", {
+    _broadcast("transcript_message", {
         "call_sid": call_sid,
         "speaker": speaker,  # "scammer" or "ai"
         "text": text,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }, room="dashboard")
+        "timestamp": _now_iso(),
+    })
 
 
 def broadcast_ai_status(status: str):
     """Update AI status on dashboard."""
-    socketio.emit("ai_status", {"status": status}, room="dashboard")
+    _broadcast("ai_status", {"status": status})
 
 
 def broadcast_typing(call_sid: str, typing: bool):
     """Show/hide typing indicator on dashboard."""
-    socketio.emit("typing_indicator", {
+    _broadcast("typing_indicator", {
         "call_sid": call_sid,
         "typing": typing,
-    }, room="dashboard")
+    })
 
 
 def broadcast_call_list():
     """Send updated call list to all dashboard clients."""
+    if _dashboard_clients == 0:
+        return
     active = get_active_calls()
     recent = get_call_history(limit=10)
-    socketio.emit("call_list_update", {
+    _broadcast("call_list_update", {
         "active_calls": active,
         "recent_calls": recent,
-    }, room="dashboard")
+    })
 
 
 def broadcast_intel(call_sid: str, intel_items: list[dict]):
     """Send extracted intel to dashboard."""
-    if not intel_items:
+    if not intel_items or _dashboard_clients == 0:
         return
 
     update = {}
     for item in intel_items:
-        field = item["field_name"]
-        value = item["field_value"]
-        if field == "scammer_name":
-            update["scammer_name"] = value
-        elif field == "scam_type":
-            update["scam_type"] = value
-        elif field == "organization_claimed":
-            update["organization_claimed"] = value
-        elif field in ("bank_mentioned",):
-            update["organization_claimed"] = value
-        elif field == "upi_id":
-            update["upi_id"] = value
-        elif field == "phone_number":
-            update["phone_number"] = value
+        key = DASHBOARD_INTEL_FIELDS.get(item["field_name"])
+        if key is not None:
+            update[key] = item["field_value"]
 
     if update:
         update["call_sid"] = call_sid
-        socketio.emit("intel_update", update, room="dashboard")
+        _broadcast("intel_update", update)
 
 
 # ---------------------------------------------------------------------------
-# Shared helpers
+# Background persistence — DB writes and intel extraction run off the
+# STT → LLM path. A single worker keeps them in submission order.
 # ---------------------------------------------------------------------------
-def process_scammer_speech(call_sid: str, speech_text: str) -> str | None:
-    """Process scammer speech through LLM and intel extraction.
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="karma-bg")
 
-    Returns AI response text, or None if muted.
-    """
-    # Save scammer message to DB
-    save_message(call_sid, "user", speech_text)
 
-    # Broadcast to dashboard
-    broadcast_ai_status("ANALYZING...")
-    broadcast_transcript(call_sid, "scammer", speech_text)
+def _log_background_error(future):
+    if future.exception() is not None:
+        logger.error("Background task failed: %s", future.exception())
+
+
+def submit_background(fn, *args):
+    """Queue *fn(*args)* on the background worker; failures are logged."""
+    _background.submit(fn, *args).add_done_callback(_log_background_error)
+
+
+def drain_background():
+    """Block until every queued background task has run (e.g. before ending a call)."""
+    _background.submit(lambda: None).result()
+
 
-    # Extract intel from scammer message
+# Request-scoped fan-out (e.g. STT alongside classification); unlike
+# _background, callers wait on these results.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="karma-io")
+
+
+def _run_intel(call_sid: str, speech_text: str):
+    """Extract, persist and broadcast intel from one scammer message."""
     intel_items = extract_intel(speech_text)
     for item in intel_items:
         save_intel(call_sid, item["field_name"], item["field_value"], item["confidence"])
     broadcast_intel(call_sid, intel_items)
 
-    # Check if AI is muted for this call
-    if mute_state.get(call_sid, False):
-        broadcast_ai_status("MUTED")
-        return None
 
-    # Show typing indicator while AI processes
-    broadcast_typing(call_sid, True)
+# ---------------------------------------------------------------------------
+# Shared helpers
+# ---------------------------------------------------------------------------
+def process_scammer_speech(call_sid: str, session: CallSession, speech_text: str) -> str | None:
+    """Process scammer speech through LLM and intel extraction.
+
+    Returns AI response text, or None if muted.
+
+    Dashboard updates go out as one batch before the LLM call and one after.
+    DB writes and intel extraction are queued on the background worker, so
+    the LLM request starts right away.
+    """
+    with batched_broadcasts():
+        # Save scammer message to DB
+        submit_background(save_message, call_sid, "user", speech_text)
+
+        # Broadcast to dashboard
+        broadcast_ai_status("ANALYZING...")
+        broadcast_transcript(call_sid, "scammer", speech_text)
+
+        # Extract intel from scammer message (broadcasts when done)
+        submit_background(_run_intel, call_sid, speech_text)
+
+        # Check if AI is muted for this call
+        if session.muted:
+            broadcast_ai_status("MUTED")
+            return None
+
+        # Show typing indicator while AI processes
+        broadcast_typing(call_sid, True)
 
     # Get AI response via OpenRouter GPT-4o
     messages = conversation_mgr.add_user_message(call_sid, speech_text)
@@ -267,15 +468,16 @@ def process_scammer_speech(call_sid: str, speech_text: str) -> str | None:
     logger.info("AI response (CallSid: %s): %s", call_sid, ai_response)
     conversation_mgr.add_assistant_message(call_sid, ai_response)
 
-    # Hide typing indicator
-    broadcast_typing(call_sid, False)
+    with batched_broadcasts():
+        # Hide typing indicator
+        broadcast_typing(call_sid, False)
 
-    # Save AI message to DB
-    save_message(call_sid, "assistant", ai_response)
+        # Save AI message to DB
+        submit_background(save_message, call_sid, "assistant", ai_response)
 
-    # Broadcast to dashboard
-    broadcast_ai_status("DEFENDING")
-    broadcast_transcript(call_sid, "ai", ai_response)
+        # Broadcast to dashboard
+        broadcast_ai_status("DEFENDING")
+        broadcast_transcript(call_sid, "ai", ai_response)
 
     return ai_response
 
@@ -291,6 +493,7 @@ def ws_connect():
 
     if role == "dashboard":
         join_room("dashboard")
+        _dashboard_joined(1)
         logger.info("Dashboard client connected: %s", request.sid)
 
         # Send currently active calls
@@ -313,19 +516,20 @@ def ws_connect():
 
     # Register as active call in DB
     create_call(session_id, caller="web-client", mode="web")
-    broadcast_call_started(session_id, "Web Client")
-    broadcast_call_list()
+    with batched_broadcasts():
+        broadcast_call_started(session_id, "Web Client")
+        broadcast_call_list()
 
     # Send greeting immediately so the caller hears it first
     try:
-        greeting_audio = _cached_greeting_web or text_to_speech(
+        greeting_audio = _cached_greeting_web or tts_cached(
             text=GREETING_TEXT,
             language_code="hi-IN",
             speaker="kavya",
             sample_rate="22050",
         )
         emit("audio_response", {
-            "audio": base64.b64encode(greeting_audio).decode("utf-8"),
+            "audio": greeting_audio,
             "text": GREETING_TEXT,
             "type": "greeting",
         })
@@ -337,7 +541,7 @@ def ws_connect():
 
     # Mark session as pending classification — the caller's first audio
     # response will be classified as AI or human.
-    classified_sessions[session_id] = "pending"
+    get_session(session_id).classification = "pending"
 
 
 @socketio.on("audio_data")
@@ -350,9 +554,11 @@ def ws_audio_data(data):
     logger.info("Received audio from web client: %s", session_id)
 
     try:
-        # Decode audio
-        audio_b64 = data.get("audio", "")
-        audio_bytes = base64.b64decode(audio_b64)
+        # Audio arrives as a binary attachment; base64 strings from older
+        # clients are still accepted
+        audio_bytes = data.get("audio", b"")
+        if isinstance(audio_bytes, str):
+            audio_bytes = base64.b64decode(audio_bytes)
         audio_format = data.get("format", "wav")
 
         if audio_format == "webm":
@@ -360,12 +566,24 @@ def ws_audio_data(data):
         else:
             wav_bytes = audio_bytes
 
+        # Near-silent clip (accidental tap, mic muted) — skip STT/classifier
+        if _is_silent(wav_bytes):
+            logger.info("Silent audio from session %s — skipping STT", session_id)
+            emit("error", {"message": NO_SPEECH_MESSAGE})
+            return
+
+        session = get_session(session_id)
+        stt_future = None
+
         # ── First audio: run AI/Human classification ──
         # Greeting was already played on connect; this is the caller's response.
-        if classified_sessions.get(session_id) == "pending":
+        if session.classification == "pending":
             emit("processing", {"stage": "classifying"})
             logger.info("Running voice classification for session %s", session_id)
 
+            # Start STT alongside the classifier — most callers are human, so
+            # the transcript is usually ready by the time the verdict is in
+            stt_future = _executor.submit(speech_to_text, wav_bytes, language_code="hi-IN")
             result = classify_audio(wav_bytes, timeout=10.0)
             prediction = result.get("prediction", "human").lower()
             confidence = result.get("confidence", 0)
@@ -374,34 +592,34 @@ def ws_audio_data(data):
                         session_id, prediction.upper(), confidence * 100)
 
             # Broadcast to dashboard
-            broadcast_transcript(
-                session_id, "system",
-                f"Caller classified as {prediction.upper()} (confidence: {confidence:.0%})",
-            )
+            with batched_broadcasts():
+                broadcast_transcript(
+                    session_id, "system",
+                    f"Caller classified as {prediction.upper()} (confidence: {confidence:.0%})",
+                )
+                if prediction == "ai":
+                    broadcast_ai_status("AI CALLER DETECTED")
 
-            classified_sessions[session_id] = prediction
+            session.classification = prediction
 
             if prediction == "ai":
+                stt_future.cancel()  # no-op if already running; result is discarded
+
                 # Send AI-detected announcement and block further processing
-                broadcast_ai_status("AI CALLER DETECTED")
-                ai_audio = _cached_ai_detected_web or text_to_speech(
+                ai_payload = _cached_ai_detected_web_payload or _ai_detected_payload(tts_cached(
                     text=AI_DETECTED_TEXT,
                     language_code="en-IN",
                     speaker="kavya",
                     sample_rate="22050",
-                )
-                emit("transcript", {"text": AI_DETECTED_TEXT, "role": "system"})
-                emit("audio_response", {
-                    "audio": base64.b64encode(ai_audio).decode("utf-8"),
-                    "text": AI_DETECTED_TEXT,
-                    "type": "ai_detected",
-                })
+                ))
+                emit("transcript", _AI_DETECTED_TRANSCRIPT)
+                emit("audio_response", ai_payload)
                 return
 
             # Human — fall through to process this first audio normally
 
         # ── If caller was classified as AI, reject further audio ──
-        if classified_sessions.get(session_id) == "ai":
+        if session.classification == "ai":
             emit("error", {"message": "Caller classified as AI — conversation blocked."})
             return
 
@@ -409,18 +627,21 @@ def ws_audio_data(data):
 
         # Step 1: STT
         emit("processing", {"stage": "stt"})
-        transcript = speech_to_text(wav_bytes, language_code="hi-IN")
+        if stt_future is not None:
+            transcript = stt_future.result()
+        else:
+            transcript = speech_to_text(wav_bytes, language_code="hi-IN")
         logger.info("STT result (session %s): %s", session_id, transcript)
 
         if not transcript.strip():
-            emit("error", {"message": "Sunai nahi diya... please phir se bolo!"})
+            emit("error", {"message": NO_SPEECH_MESSAGE})
             return
 
         emit("transcript", {"text": transcript, "role": "user"})
 
         # Step 2: LLM + intel extraction
         emit("processing", {"stage": "thinking"})
-        ai_response = process_scammer_speech(session_id, transcript)
+        ai_response = process_scammer_speech(session_id, session, transcript)
 
         if ai_response is None:
             emit("error", {"message": "AI is muted"})
@@ -428,20 +649,22 @@ def ws_audio_data(data):
 
         emit("transcript", {"text": ai_response, "role": "assistant"})
 
-        # Step 3: TTS
+        # Step 3: TTS, one sentence at a time — playback starts as soon as
+        # the first sentence is synthesized instead of after the whole reply
         emit("processing", {"stage": "tts"})
-        response_audio = text_to_speech(
-            text=ai_response,
-            language_code="hi-IN",
-            speaker="kavya",
-            sample_rate="22050",
-        )
-
-        emit("audio_response", {
-            "audio": base64.b64encode(response_audio).decode("utf-8"),
-            "text": ai_response,
-            "type": "response",
-        })
+        sentences = _split_sentences(ai_response)
+        for seq, sentence in enumerate(sentences):
+            sentence_audio = tts_cached(
+                text=sentence,
+                language_code="hi-IN",
+                speaker="kavya",
+                sample_rate="22050",
+            )
+            emit("audio_chunk", {
+                "audio": sentence_audio,
+                "seq": seq,
+                "final": seq == len(sentences) - 1,
+            })
 
     except Exception as e:
         logger.error("Error processing web audio (session %s): %s", session_id, e)
@@ -454,11 +677,12 @@ def ws_end_call():
     session_id = request.sid
     logger.info("Web client ending call: %s", session_id)
     conversation_mgr.end_conversation(session_id)
-    mute_state.pop(session_id, None)
-    classified_sessions.pop(session_id, None)
+    sessions.pop(session_id, None)
+    drain_background()
     db_end_call(session_id, "completed")
-    broadcast_call_ended(session_id)
-    broadcast_call_list()
+    with batched_broadcasts():
+        broadcast_call_ended(session_id)
+        broadcast_call_list()
     emit("call_ended", {"message": "Call ended. Phir milenge!"})
 
 
@@ -469,16 +693,18 @@ def ws_disconnect():
     role = request.args.get("role", "")
 
     if role == "dashboard":
+        _dashboard_joined(-1)
         logger.info("Dashboard client disconnected: %s", session_id)
         return
 
     logger.info("Web client disconnected: %s", session_id)
     conversation_mgr.end_conversation(session_id)
-    mute_state.pop(session_id, None)
-    classified_sessions.pop(session_id, None)
+    sessions.pop(session_id, None)
+    drain_background()
     db_end_call(session_id, "completed")
-    broadcast_call_ended(session_id)
-    broadcast_call_list()
+    with batched_broadcasts():
+        broadcast_call_ended(session_id)
+        broadcast_call_list()
 
 
 # Dashboard control events
@@ -488,7 +714,7 @@ def ws_mute_ai(data):
     call_sid = data.get("call_sid")
     muted = data.get("muted", False)
     if call_sid:
-        mute_state[call_sid] = muted
+        get_session(call_sid).muted = muted
         logger.info("AI %s for call %s", "muted" if muted else "unmuted", call_sid)
         broadcast_ai_status("MUTED" if muted else "ACTIVE")
 
@@ -503,42 +729,91 @@ def ws_drop_call(data):
     logger.info("Dashboard dropping call: %s", call_sid)
 
     # For Twilio calls, try to end the call via API
-    if MODE in ("twilio", "both") and call_sid.startswith("CA"):
+    if _twilio_client is not None and call_sid.startswith("CA"):
         try:
-            from twilio.rest import Client
-            client = Client(
-                os.getenv("TWILIO_ACCOUNT_SID"),
-                os.getenv("TWILIO_AUTH_TOKEN"),
-            )
-            client.calls(call_sid).update(status="completed")
+            _twilio_client.calls(call_sid).update(status="completed")
         except Exception as e:
             logger.error("Failed to drop Twilio call: %s", e)
 
     conversation_mgr.end_conversation(call_sid)
-    mute_state.pop(call_sid, None)
+    sessions.pop(call_sid, None)
+    drain_background()
     db_end_call(call_sid, "dropped")
-    broadcast_call_ended(call_sid)
-    broadcast_call_list()
+    with batched_broadcasts():
+        broadcast_call_ended(call_sid)
+        broadcast_call_list()
+
+
+# WebM/opus on stdin → 16 kHz mono PCM16 WAV on stdout, one decode pass
+_FFMPEG_CMD = [
+    "ffmpeg", "-hide_banner", "-loglevel", "error",
+    "-f", "webm", "-i", "pipe:0",
+    "-ac", "1", "-ar", "16000", "-acodec", "pcm_s16le",
+    # No LIST/INFO chunk, so the header is the canonical 44 bytes
+    "-map_metadata", "-1", "-fflags", "+bitexact",
+    "-f", "wav", "pipe:1",
+]
+
+
+NO_SPEECH_MESSAGE = "Sunai nahi diya... please phir se bolo!"
+SILENCE_RMS_THRESHOLD = 150  # PCM16 RMS; ~-47 dBFS
+
+
+def _is_silent(wav_bytes: bytes) -> bool:
+    """Cheap energy gate on a PCM16 WAV (header bytes are negligible)."""
+    pcm = memoryview(wav_bytes)[44:]
+    pcm = pcm[: len(pcm) & ~1]  # whole 16-bit samples only
+    return len(pcm) == 0 or audioop.rms(pcm, 2) < SILENCE_RMS_THRESHOLD
+
+
+def _split_sentences(text: str) -> list[str]:
+    """Split a reply into TTS-sized sentences (same rules as the Twilio stream)."""
+    sentences = []
+    rest = text.strip()
+    while rest:
+        sentence = TwilioStreamHandler._extract_sentence(rest)
+        if not sentence:
+            break
+        sentences.append(sentence)
+        rest = rest[len(sentence):].lstrip()
+    if rest:
+        sentences.append(rest)
+    return sentences
 
 
 def _convert_webm_to_wav(webm_bytes: bytes) -> bytes:
     """Convert WebM/opus audio to WAV format."""
-    from pydub import AudioSegment
-    audio = AudioSegment.from_file(io.BytesIO(webm_bytes), format="webm")
-    audio = audio.set_channels(1).set_frame_rate(16000).set_sample_width(2)
-    wav_buffer = io.BytesIO()
-    audio.export(wav_buffer, format="wav")
-    wav_buffer.seek(0)
-    return wav_buffer.read()
+    result = subprocess.run(_FFMPEG_CMD, input=webm_bytes, capture_output=True, check=True)
+    # ffmpeg can't seek back on a pipe, so the RIFF and data sizes are left as
+    # placeholders; fill them in from the actual output length
+    wav = bytearray(result.stdout)
+    pos = 12  # skip "RIFF", file size, "WAVE"
+    while pos + 8 <= len(wav):
+        if wav[pos:pos + 4] == b"data":
+            struct.pack_into("<I", wav, 4, len(wav) - 8)
+            struct.pack_into("<I", wav, pos + 4, len(wav) - pos - 8)
+            break
+        chunk_size = struct.unpack_from("<I", wav, pos + 4)[0]
+        pos += 8 + chunk_size + (chunk_size & 1)  # chunks are word-aligned
+    return bytes(wav)
 
 
 # ===================================================================
 #  TWILIO MODE — Bidirectional Media Streams (low-latency)
 # ===================================================================
 
+_twilio_client = None  # REST client for dashboard drops; one HTTP session reused
+
 if MODE in ("twilio", "both"):
+    from twilio.rest import Client as _TwilioClient
     from twilio.twiml.voice_response import Connect, Stream, VoiceResponse
 
+    if os.getenv("TWILIO_ACCOUNT_SID"):
+        _twilio_client = _TwilioClient(
+            os.getenv("TWILIO_ACCOUNT_SID"),
+            os.getenv("TWILIO_AUTH_TOKEN"),
+        )
+
 
 @app.route("/voice", methods=["POST"])
 def voice():
@@ -553,10 +828,11 @@ def voice():
     # Set up conversation, DB record, and dashboard broadcast
     conversation_mgr.get_or_create(call_sid)
     create_call(call_sid, caller=caller, mode="twilio")
-    broadcast_call_started(call_sid, caller)
-    broadcast_call_list()
     save_message(call_sid, "assistant", GREETING_TEXT)
-    broadcast_transcript(call_sid, "ai", GREETING_TEXT)
+    with batched_broadcasts():
+        broadcast_call_started(call_sid, caller)
+        broadcast_call_list()
+        broadcast_transcript(call_sid, "ai", GREETING_TEXT)
 
     # Build TwiML: open a bidirectional media stream to our WebSocket
     response = VoiceResponse()
@@ -580,9 +856,9 @@ def media_stream(ws):
         ws,
         socketio=socketio,
         conversation_mgr=conversation_mgr,
-        mute_state=mute_state,
-        greeting_mulaw=_cached_greeting_mulaw,
-        ai_detected_mulaw=_cached_ai_detected_mulaw,
+        sessions=sessions,
+        greeting_frames=_cached_greeting_frames,
+        ai_detected_frames=_cached_ai_detected_frames,
     )
     handler.run()
 
@@ -596,12 +872,14 @@ def call_status():
 
     if status in ("completed", "failed", "busy", "no-answer", "canceled"):
         conversation_mgr.end_conversation(call_sid)
-        mute_state.pop(call_sid, None)
+        sessions.pop(call_sid, None)
 
         # Update DB and broadcast
+        drain_background()
         db_end_call(call_sid, status)
-        broadcast_call_ended(call_sid)
-        broadcast_call_list()
+        with batched_broadcasts():
+            broadcast_call_ended(call_sid)
+            broadcast_call_list()
 
     return "", 200
 
@@ -639,16 +917,22 @@ def api_calls():
     return jsonify({"calls": calls, "total": total, "limit": limit, "offset": offset})
 
 
+def _load_call_data(call_id: str) -> tuple[dict | None, list[dict], list[dict]]:
+    """(call, messages, intel) — the three reads are independent and each
+    opens its own SQLite connection, so they run concurrently."""
+    call_future = _executor.submit(get_call, call_id)
+    messages_future = _executor.submit(get_call_transcript, call_id)
+    intel = get_call_intel(call_id)
+    return call_future.result(), messages_future.result(), intel
+
+
 @app.route("/api/calls/<call_id>/transcript", methods=["GET"])
 def api_call_transcript(call_id: str):
     """Full transcript + intel for a specific call."""
-    call = get_call(call_id)
+    call, messages, intel = _load_call_data(call_id)
     if not call:
         return jsonify({"error": "Call not found"}), 404
 
-    messages = get_call_transcript(call_id)
-    intel = get_call_intel(call_id)
-
     return jsonify({
         "call": call,
         "messages": messages,
@@ -656,57 +940,98 @@ def api_call_transcript(call_id: str):
     })
 
 
-@app.route("/api/calls/<call_id>/summary", methods=["GET"])
-def api_call_summary(call_id: str):
-    """AI-generated summary for a call."""
-    messages = get_call_transcript(call_id)
-    if not messages:
-        return jsonify({"error": "No transcript found"}), 404
+# One LLM "report" per transcript feeds both /summary and /analysis: the
+# dossier JSON carries the bullet summary too, so the routes share a call.
+# The summaries come first so the streaming route can send them early.
+_REPORT_SYSTEM_PROMPT = (
+    "You are a scam call analyst for Karma AI, a system that intercepts scam calls with an AI grandmother persona.\n"
+    "Analyze the following scam call transcript and return a JSON object with this EXACT structure (no markdown, no explanation, ONLY valid JSON):\n\n"
+    "{\n"
+    '  "summary": "2-3 sentence English summary of the call",\n'
+    '  "bullet_summary": "3-5 concise bullet points: scammer tactics, information extracted, how the AI wasted their time, risk assessment",\n'
+    '  "scammer_profile": {\n'
+    '    "name": "name if mentioned, otherwise Unknown",\n'
+    '    "organization_claimed": "org they claim to represent",\n'
+    '    "phone_number": "if visible",\n'
+    '    "location_hints": "any location clues from speech patterns or mentions"\n'
+    "  },\n"
+    '  "scam_analysis": {\n'
+    '    "type": "KYC Fraud / Lottery / Bank Impersonation / Tech Support / Insurance / Refund / OTP / UPI / Other",\n'
+    '    "tactics_used": ["list", "of", "tactics"],\n'
+    '    "threat_level": "HIGH or MEDIUM or LOW",\n'
+    '    "sophistication": "HIGH or MEDIUM or LOW"\n'
+    "  },\n"
+    '  "extracted_data": {\n'
+    '    "upi_ids": [],\n'
+    '    "phone_numbers": [],\n'
+    '    "bank_accounts": [],\n'
+    '    "aadhaar_numbers": [],\n'
+    '    "banks_mentioned": []\n'
+    "  },\n"
+    '  "call_metrics": {\n'
+    '    "messages_exchanged": 0,\n'
+    '    "scammer_frustration_level": "LOW or MEDIUM or HIGH or EXTREME",\n'
+    '    "time_wasted_effectively": true\n'
+    "  },\n"
+    '  "key_moments": ["moment 1", "moment 2", "moment 3"]\n'
+    "}\n\n"
+    "Rules:\n"
+    "- Respond with ONLY the JSON object, nothing else\n"
+    "- Fill every field based on the transcript\n"
+    "- For missing data, use empty strings or empty arrays\n"
+    "- Tactics include: urgency, authority impersonation, fear, fake deadlines, emotional manipulation, technical jargon, etc.\n"
+    "- Frustration level: judge from scammer's tone/caps/repetition/threats\n"
+    "- Key moments: 3-5 most important events in the call"
+)
 
-    intel = get_call_intel(call_id)
+REPORT_CACHE_MAX = 128
+_report_cache: OrderedDict[tuple[str, int], str] = OrderedDict()
+_report_cache_lock = threading.Lock()
 
-    # Build summary prompt
-    transcript_text = "\n".join(
-        f"{'Scammer' if m['role'] == 'user' else 'AI Dadi'}: {m['content']}"
-        for m in messages
-    )
 
-    summary_messages = [
-        {
-            "role": "system",
-            "content": (
-                "You are a scam analyst. Summarize this scam call transcript. "
-                "Include: scammer's tactics, information extracted, how AI wasted their time, "
-                "and risk assessment. Keep it concise (3-5 bullet points). Respond in English."
-            ),
-        },
-        {"role": "user", "content": f"Transcript:\n{transcript_text}"},
-    ]
+def _remember_report(key: tuple[str, int], raw: str):
+    with _report_cache_lock:
+        _report_cache[key] = raw
+        while len(_report_cache) > REPORT_CACHE_MAX:
+            _report_cache.popitem(last=False)
+
 
+def _cached_report(call_id: str, message_count: int) -> str | None:
+    """Report from the in-process LRU, else the call_reports table."""
+    key = (call_id, message_count)
+    with _report_cache_lock:
+        raw = _report_cache.get(key)
+        if raw is not None:
+            _report_cache.move_to_end(key)
+            return raw
+
+    raw = get_call_report(call_id, message_count)
+    if raw is not None:
+        _remember_report(key, raw)
+    return raw
+
+
+def _store_report(call_id: str, message_count: int, raw: str):
+    """Cache a report only if it parses to a JSON object: an empty, truncated
+    or non-JSON reply is regenerated on the next request, not served forever."""
     try:
-        summary = chat_completion(summary_messages, temperature=0.3)
-        return jsonify({"summary": summary, "intel": intel})
-    except Exception as e:
-        logger.error("Error generating summary: %s", e)
-        return jsonify({"error": str(e)}), 500
+        if not raw.strip() or not isinstance(_parse_report(raw), dict):
+            return
+    except json.JSONDecodeError:
+        logger.warning("Report for call %s is not valid JSON; not caching it", call_id)
+        return
+    save_call_report(call_id, message_count, raw)
+    _remember_report((call_id, message_count), raw)
 
 
-@app.route("/api/calls/<call_id>/analysis", methods=["GET"])
-def api_call_analysis(call_id: str):
-    """Deep AI analysis of a scam call — returns structured JSON dossier."""
-    messages = get_call_transcript(call_id)
-    if not messages:
-        return jsonify({"error": "No transcript found"}), 404
+_SPEAKER_LABELS = {"user": "Scammer"}  # every other role is the AI side
 
-    call = get_call(call_id)
-    intel = get_call_intel(call_id)
 
-    # Build transcript text
-    transcript_text = "\n".join(
-        f"{'Scammer' if m['role'] == 'user' else 'AI Dadi'}: {m['content']}"
-        for m in messages
-        if m['role'] != 'system'
-    )
+def _report_prompt(messages: list[dict], intel: list[dict]) -> list[dict]:
+    label = _SPEAKER_LABELS.get
+    transcript_text = "\n".join([
+        f"{label(m['role'], 'AI Dadi')}: {m['content']}" for m in messages
+    ])
 
     # Include already-extracted intel for context
     intel_context = ""
@@ -716,105 +1041,169 @@ def api_call_analysis(call_id: str):
             for i in intel
         )
 
-    analysis_prompt = [
-        {
-            "role": "system",
-            "content": (
-                "You are a scam call analyst for Karma AI, a system that intercepts scam calls with an AI grandmother persona.\n"
-                "Analyze the following scam call transcript and return a JSON object with this EXACT structure (no markdown, no explanation, ONLY valid JSON):\n\n"
-                "{\n"
-                '  "scammer_profile": {\n'
-                '    "name": "name if mentioned, otherwise Unknown",\n'
-                '    "organization_claimed": "org they claim to represent",\n'
-                '    "phone_number": "if visible",\n'
-                '    "location_hints": "any location clues from speech patterns or mentions"\n'
-                "  },\n"
-                '  "scam_analysis": {\n'
-                '    "type": "KYC Fraud / Lottery / Bank Impersonation / Tech Support / Insurance / Refund / OTP / UPI / Other",\n'
-                '    "tactics_used": ["list", "of", "tactics"],\n'
-                '    "threat_level": "HIGH or MEDIUM or LOW",\n'
-                '    "sophistication": "HIGH or MEDIUM or LOW"\n'
-                "  },\n"
-                '  "extracted_data": {\n'
-                '    "upi_ids": [],\n'
-                '    "phone_numbers": [],\n'
-                '    "bank_accounts": [],\n'
-                '    "aadhaar_numbers": [],\n'
-                '    "banks_mentioned": []\n'
-                "  },\n"
-                '  "call_metrics": {\n'
-                '    "messages_exchanged": 0,\n'
-                '    "scammer_frustration_level": "LOW or MEDIUM or HIGH or EXTREME",\n'
-                '    "time_wasted_effectively": true\n'
-                "  },\n"
-                '  "summary": "2-3 sentence English summary of the call",\n'
-                '  "key_moments": ["moment 1", "moment 2", "moment 3"]\n'
-                "}\n\n"
-                "Rules:\n"
-                "- Respond with ONLY the JSON object, nothing else\n"
-                "- Fill every field based on the transcript\n"
-                "- For missing data, use empty strings or empty arrays\n"
-                "- Tactics include: urgency, authority impersonation, fear, fake deadlines, emotional manipulation, technical jargon, etc.\n"
-                "- Frustration level: judge from scammer's tone/caps/repetition/threats\n"
-                "- Key moments: 3-5 most important events in the call"
-            ),
-        },
-        {
-            "role": "user",
-            "content": f"Transcript:\n{transcript_text}{intel_context}",
-        },
+    return [
+        {"role": "system", "content": _REPORT_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Transcript:\n{transcript_text}{intel_context}"},
     ]
 
-    import json as json_mod
+
+def _generate_report(call_id: str, messages: list[dict], intel: list[dict]) -> str:
+    """Raw LLM report for a call, cached on (call_id, message count).
+
+    Hot reports come from the in-process LRU, older ones from the
+    call_reports table; the LLM only runs when the transcript has changed
+    since the last report.
+    """
+    raw = _cached_report(call_id, len(messages))
+    if raw is None:
+        raw = chat_completion(_report_prompt(messages, intel), temperature=0.2)
+        _store_report(call_id, len(messages), raw)
+    return raw
+
+
+def _parse_report(raw: str) -> dict:
+    """Parse the report JSON (strips markdown fences). Raises JSONDecodeError."""
+    json_str = raw.strip()
+    if json_str.startswith("```"):
+        json_str = json_str.split("\n", 1)[1] if "\n" in json_str else json_str[3:]
+        if json_str.endswith("```"):
+            json_str = json_str[:-3]
+        json_str = json_str.strip()
+    return json.loads(json_str)
+
+
+def _load_report_inputs(call_id: str) -> tuple[dict | None, list[dict], list[dict]]:
+    """Like _load_call_data, minus system messages (not part of the report)."""
+    call, messages, intel = _load_call_data(call_id)
+    return call, [m for m in messages if m["role"] != "system"], intel
+
+
+@app.route("/api/calls/<call_id>/summary", methods=["GET"])
+def api_call_summary(call_id: str):
+    """AI-generated summary for a call."""
+    _, messages, intel = _load_report_inputs(call_id)
+    if not messages:
+        return jsonify({"error": "No transcript found"}), 404
 
     try:
-        raw = chat_completion(analysis_prompt, temperature=0.2)
-
-        # Parse JSON from LLM response (strip markdown fences if present)
-        json_str = raw.strip()
-        if json_str.startswith("```"):
-            json_str = json_str.split("\n", 1)[1] if "\n" in json_str else json_str[3:]
-            if json_str.endswith("```"):
-                json_str = json_str[:-3]
-            json_str = json_str.strip()
-
-        analysis = json_mod.loads(json_str)
-
-        # Enrich with DB data
-        if call:
-            analysis["call_metrics"]["duration_seconds"] = call.get("duration_seconds", 0)
-            analysis["call_metrics"]["call_mode"] = call.get("mode", "unknown")
-            analysis["call_metrics"]["caller_number"] = call.get("caller_number", "unknown")
-
-        analysis["call_metrics"]["messages_exchanged"] = len(
-            [m for m in messages if m["role"] != "system"]
-        )
+        raw = _generate_report(call_id, messages, intel)
+    except Exception as e:
+        logger.error("Error generating summary: %s", e)
+        return jsonify({"error": str(e)}), 500
+
+    try:
+        report = _parse_report(raw)
+        summary = report.get("bullet_summary") or report.get("summary", "")
+    except json.JSONDecodeError:
+        summary = raw  # LLM didn't return valid JSON — the text is still a summary
+    return jsonify({"summary": summary, "intel": intel})
+
+
+# Intel field_name → list in the dossier's "extracted_data"
+_EXTRACTED_DATA_FIELDS = {
+    "upi_id": "upi_ids",
+    "phone_number": "phone_numbers",
+    "account_number": "bank_accounts",
+    "aadhaar_number": "aadhaar_numbers",
+    "bank_mentioned": "banks_mentioned",
+}
+
+
+def _analysis_payload(raw: str, call: dict | None, messages: list[dict],
+                      intel: list[dict]) -> dict:
+    """Response body for /analysis: the parsed dossier enriched with DB data,
+    or the raw text as "raw_summary" if the LLM didn't return valid JSON."""
+    try:
+        analysis = _parse_report(raw)
+    except json.JSONDecodeError:
+        return {"analysis": None, "raw_summary": raw, "intel": intel}
+
+    # Enrich with DB data
+    if call:
+        analysis["call_metrics"]["duration_seconds"] = call.get("duration_seconds", 0)
+        analysis["call_metrics"]["call_mode"] = call.get("mode", "unknown")
+        analysis["call_metrics"]["caller_number"] = call.get("caller_number", "unknown")
+
+    analysis["call_metrics"]["messages_exchanged"] = len(messages)
+
+    # Merge DB intel into extracted_data (deduped, LLM values first)
+    extracted = analysis["extracted_data"]
+    seen: dict[str, set] = {}
+    for item in intel:
+        key = _EXTRACTED_DATA_FIELDS.get(item["field_name"])
+        if key is None:
+            continue
+        if key not in seen:
+            seen[key] = set(extracted.get(key, ()))
+        value = item["field_value"]
+        if value not in seen[key]:
+            seen[key].add(value)
+            extracted.setdefault(key, []).append(value)
+
+    return {"analysis": analysis, "intel": intel}
+
+
+@app.route("/api/calls/<call_id>/analysis", methods=["GET"])
+def api_call_analysis(call_id: str):
+    """Deep AI analysis of a scam call — returns structured JSON dossier."""
+    call, messages, intel = _load_report_inputs(call_id)
+    if not messages:
+        return jsonify({"error": "No transcript found"}), 404
 
-        # Merge DB intel into extracted_data
-        for item in intel:
-            fn = item["field_name"]
-            fv = item["field_value"]
-            if fn == "upi_id" and fv not in analysis["extracted_data"].get("upi_ids", []):
-                analysis["extracted_data"].setdefault("upi_ids", []).append(fv)
-            elif fn == "phone_number" and fv not in analysis["extracted_data"].get("phone_numbers", []):
-                analysis["extracted_data"].setdefault("phone_numbers", []).append(fv)
-            elif fn == "account_number" and fv not in analysis["extracted_data"].get("bank_accounts", []):
-                analysis["extracted_data"].setdefault("bank_accounts", []).append(fv)
-            elif fn == "aadhaar_number" and fv not in analysis["extracted_data"].get("aadhaar_numbers", []):
-                analysis["extracted_data"].setdefault("aadhaar_numbers", []).append(fv)
-            elif fn == "bank_mentioned" and fv not in analysis["extracted_data"].get("banks_mentioned", []):
-                analysis["extracted_data"].setdefault("banks_mentioned", []).append(fv)
-
-        return jsonify({"analysis": analysis, "intel": intel})
-
-    except json_mod.JSONDecodeError:
-        # LLM didn't return valid JSON — return raw text as summary fallback
-        return jsonify({"analysis": None, "raw_summary": raw, "intel": intel})
+    try:
+        raw = _generate_report(call_id, messages, intel)
+        return jsonify(_analysis_payload(raw, call, messages, intel))
     except Exception as e:
         logger.error("Error generating analysis: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
+# Completed "summary" string in a partially streamed report
+_SUMMARY_FIELD_RE = re.compile(r'"summary"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+
+@app.route("/api/calls/<call_id>/analysis/stream", methods=["GET"])
+def api_call_analysis_stream(call_id: str):
+    """/analysis as server-sent events: "summary" as soon as the LLM has
+    written it, then "analysis" with the same body /analysis returns
+    ("failure" on error)."""
+    call, messages, intel = _load_report_inputs(call_id)
+    if not messages:
+        return jsonify({"error": "No transcript found"}), 404
+
+    def events():
+        try:
+            raw = _cached_report(call_id, len(messages))
+            if raw is None:
+                raw = ""
+                summary_sent = False
+                for token in chat_completion_streaming(_report_prompt(messages, intel), temperature=0.2):
+                    raw += token
+                    if not summary_sent:
+                        match = _SUMMARY_FIELD_RE.search(raw)
+                        if match:
+                            summary_sent = True
+                            try:
+                                summary = json.loads(f'"{match.group(1)}"')
+                            except json.JSONDecodeError:
+                                continue  # malformed escape; the final event still has it
+                            yield _sse("summary", {"summary": summary})
+                _store_report(call_id, len(messages), raw)
+            yield _sse("analysis", _analysis_payload(raw, call, messages, intel))
+        except Exception as e:
+            logger.error("Error streaming analysis: %s", e)
+            yield _sse("failure", {"error": str(e)})
+
+    return Response(events(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # don't let a reverse proxy buffer events
+    })
+
+
 @app.route("/api/active-calls", methods=["GET"])
 def api_active_calls():
     """List currently active calls."""
@@ -1,19 +1,39 @@
 """Cartesia AI API service - TTS (Sonic 3) and STT (ink-whisper)."""
 
 import base64
-import io
 import json
 import logging
 import os
+import queue
 import struct
+import threading
 import time
 import uuid
+from collections import deque
 
 import requests
 import websocket  # websocket-client library
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+# WebSocket message codec — orjson on the per-chunk paths when installed.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch
+# the stdlib exception either way.
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 CARTESIA_API_KEY = os.getenv("CARTESIA_API_KEY", "")
 CARTESIA_VERSION = "2025-04-16"
 CARTESIA_TTS_URL = "https://api.cartesia.ai/tts/bytes"
@@ -34,6 +54,9 @@ _session.headers.update({
 MAX_RETRIES = 3
 RETRY_DELAY = 1
 
+# BCP-47 → Cartesia 2-letter language code
+_LANG_MAP = {"hi-IN": "hi", "en-US": "en", "en-IN": "en"}
+
 
 def _retry_request(method, url, retries=MAX_RETRIES, **kwargs):
     """Make an HTTP request with automatic retries on 5xx errors."""
@@ -126,109 +149,140 @@ def text_to_speech(
 
 
 def _extract_raw_pcm_from_wav(wav_bytes: bytes) -> bytes:
-    """Strip WAV header and return raw PCM data."""
-    buf = io.BytesIO(wav_bytes)
-    # Skip RIFF header (44 bytes for standard WAV)
-    buf.read(4)  # "RIFF"
-    buf.read(4)  # file size
-    buf.read(4)  # "WAVE"
+    """Strip WAV header and return raw PCM data.
+
+    Walks the chunk headers in place; only the PCM slice itself is copied.
+    """
+    view = memoryview(wav_bytes)
+    pos = 12  # skip "RIFF", file size, "WAVE"
 
     # Find "data" chunk
-    while True:
-        chunk_id = buf.read(4)
-        if len(chunk_id) < 4:
-            # Fallback: just skip first 44 bytes
-            return wav_bytes[44:]
-        chunk_size = struct.unpack("<I", buf.read(4))[0]
+    while pos + 8 <= len(view):
+        chunk_id = view[pos: pos + 4]
+        chunk_size = struct.unpack_from("<I", view, pos + 4)[0]
+        pos += 8
         if chunk_id == b"data":
-            return buf.read(chunk_size)
-        buf.read(chunk_size)
+            return view[pos: pos + chunk_size].tobytes()
+        pos += chunk_size + (chunk_size & 1)  # chunks are word-aligned
 
+    # Fallback: just skip first 44 bytes
+    return wav_bytes[44:]
 
-def speech_to_text(audio_bytes: bytes, language_code: str = "hi-IN") -> str:
-    """Convert speech audio to text using Cartesia ink-whisper (WebSocket STT).
 
-    Args:
-        audio_bytes: Raw audio bytes (WAV format).
-        language_code: BCP-47 language code.
+# ---------------------------------------------------------------------------
+#  STT connection pool — ink-whisper sockets are kept open between utterances
+#  ("finalize" flushes a transcript without ending the session), so only the
+#  first request per language pays the TLS + WebSocket handshake.
+# ---------------------------------------------------------------------------
 
-    Returns:
-        Transcribed text string.
-    """
-    lang_map = {
-        "hi-IN": "hi",
-        "en-US": "en",
-        "en-IN": "en",
-    }
-    cartesia_lang = lang_map.get(language_code, language_code.split("-")[0])
+STT_POOL_SIZE = 2  # idle sockets kept per language
+_stt_pools: dict[str, queue.LifoQueue] = {}
+_stt_pools_lock = threading.Lock()
 
-    # Extract raw PCM from WAV for WebSocket streaming
-    raw_pcm = _extract_raw_pcm_from_wav(audio_bytes)
 
+def _stt_pool(language: str) -> queue.LifoQueue:
+    with _stt_pools_lock:
+        pool = _stt_pools.get(language)
+        if pool is None:
+            pool = _stt_pools[language] = queue.LifoQueue(maxsize=STT_POOL_SIZE)
+        return pool
+
+
+def _stt_connect(language: str) -> websocket.WebSocket:
     ws_url = (
         f"{CARTESIA_STT_WS_URL}"
         f"?api_key={CARTESIA_API_KEY}"
         f"&cartesia_version={CARTESIA_VERSION}"
         f"&model=ink-whisper"
-        f"&language={cartesia_lang}"
+        f"&language={language}"
         f"&encoding=pcm_s16le"
         f"&sample_rate=16000"
     )
+    ws = websocket.create_connection(ws_url, timeout=30)
+    logger.debug("Cartesia STT WebSocket connected (%s)", language)
+    return ws
+
+
+def _stt_release(language: str, ws: websocket.WebSocket):
+    """Return a healthy socket to the pool, or close it if the pool is full."""
+    try:
+        _stt_pool(language).put_nowait(ws)
+    except queue.Full:
+        ws.close()
 
-    transcript_parts = []
-    error_msg = None
-    done_received = False
 
-    def on_message(ws, message):
-        nonlocal done_received
+def _stt_transcribe(ws: websocket.WebSocket, raw_pcm: bytes) -> str:
+    """Stream *raw_pcm* over an open STT socket and collect the transcript."""
+    chunk_size = 8192  # 8KB chunks
+    for i in range(0, len(raw_pcm), chunk_size):
+        ws.send(raw_pcm[i: i + chunk_size], opcode=websocket.ABNF.OPCODE_BINARY)
+    ws.send("finalize")
+
+    transcript_parts = []
+    while True:
+        message = ws.recv()
+        if not message:
+            raise ConnectionError("Cartesia STT socket closed mid-transcript")
         try:
-            data = json.loads(message)
-            msg_type = data.get("type", "")
-
-            if msg_type == "transcript":
-                # Collect final transcripts
-                for word in data.get("words", []):
-                    transcript_parts.append(word.get("word", ""))
-            elif msg_type == "done":
-                done_received = True
-                ws.close()
-            elif msg_type == "error":
-                nonlocal error_msg
-                error_msg = data.get("message", "Unknown STT error")
-                ws.close()
+            data = _json_loads(message)
         except json.JSONDecodeError:
-            pass
+            continue
+        msg_type = data.get("type", "")
+
+        if msg_type == "transcript":
+            # Collect final transcripts
+            for word in data.get("words", []):
+                transcript_parts.append(word.get("word", ""))
+        elif msg_type in ("flush_done", "done"):
+            return " ".join(transcript_parts).strip()
+        elif msg_type == "error":
+            raise RuntimeError(
+                f"Cartesia STT error: {data.get('message', 'Unknown STT error')}"
+            )
 
-    def on_error(ws, error):
-        nonlocal error_msg
-        error_msg = str(error)
-        logger.error("Cartesia STT WebSocket error: %s", error)
-
-    def on_open(ws):
-        # Send audio data in chunks
-        chunk_size = 8192  # 8KB chunks
-        for i in range(0, len(raw_pcm), chunk_size):
-            chunk = raw_pcm[i : i + chunk_size]
-            ws.send(chunk, opcode=websocket.ABNF.OPCODE_BINARY)
-
-        # Signal end of audio
-        ws.send("done")
-
-    ws = websocket.WebSocketApp(
-        ws_url,
-        on_message=on_message,
-        on_error=on_error,
-        on_open=on_open,
-    )
 
-    # Run with timeout
-    ws.run_forever(ping_interval=10, ping_timeout=5)
+def speech_to_text(audio_bytes: bytes, language_code: str = "hi-IN") -> str:
+    """Convert speech audio to text using Cartesia ink-whisper (WebSocket STT).
 
-    if error_msg:
-        logger.error("Cartesia STT error: %s", error_msg)
-        raise RuntimeError(f"Cartesia STT error: {error_msg}")
+    Args:
+        audio_bytes: Raw audio bytes (WAV format).
+        language_code: BCP-47 language code.
+
+    Returns:
+        Transcribed text string.
+    """
+    cartesia_lang = _LANG_MAP.get(language_code, language_code.split("-")[0])
 
-    transcript = " ".join(transcript_parts).strip()
+    # Extract raw PCM from WAV for WebSocket streaming
+    raw_pcm = _extract_raw_pcm_from_wav(audio_bytes)
+
+    try:
+        ws = _stt_pool(cartesia_lang).get_nowait()
+        pooled = True
+    except queue.Empty:
+        ws = _stt_connect(cartesia_lang)
+        pooled = False
+
+    try:
+        transcript = _stt_transcribe(ws, raw_pcm)
+    except (websocket.WebSocketException, ConnectionError, OSError) as e:
+        ws.close()
+        if not pooled:
+            logger.error("Cartesia STT WebSocket error: %s", e)
+            raise
+        # Idle pooled socket was dropped by the server — retry on a fresh one
+        logger.debug("Stale Cartesia STT socket (%s), reconnecting", e)
+        ws = _stt_connect(cartesia_lang)
+        try:
+            transcript = _stt_transcribe(ws, raw_pcm)
+        except Exception:
+            ws.close()
+            raise
+    except Exception:
+        ws.close()
+        raise
+
+    _stt_release(cartesia_lang, ws)
     logger.info("Cartesia STT transcript: %s", transcript)
     return transcript
 
@@ -237,29 +291,73 @@ def speech_to_text(audio_bytes: bytes, language_code: str = "hi-IN") -> str:
 #  Streaming TTS via WebSocket — outputs pcm_mulaw 8kHz for Twilio
 # ---------------------------------------------------------------------------
 
-_LANG_MAP = {"hi-IN": "hi", "en-US": "en", "en-IN": "en"}
-
 
 class CartesiaTTSStreamer:
     """Persistent Cartesia WebSocket connection for streaming TTS.
 
     Outputs raw pcm_mulaw at 8kHz — the base64 data from each chunk can be
     forwarded directly to Twilio Media Streams with zero conversion.
+
+    Sockets are pooled at class level: ``close()`` hands a cleanly finished
+    socket back for the next streamer, so back-to-back utterances skip the
+    TLS + WebSocket handshake. A ping only fails once the local side sees the
+    drop, so pooled sockets also expire after ``POOL_IDLE_SECONDS``, and a
+    pooled socket that closes before its first chunk is retried once on a
+    fresh connection.
     """
 
+    POOL_SIZE = 4
+    POOL_IDLE_SECONDS = 60  # older idle sockets are closed rather than reused
+    _pool: deque = deque()  # (socket, time.monotonic() when it was returned)
+    _pool_lock = threading.Lock()
+
     def __init__(self, language_code: str = "hi-IN"):
         self.language = _LANG_MAP.get(language_code, language_code.split("-")[0])
         self.ws = None
+        self._pooled = False  # self.ws came from the pool (may be stale)
+        self._reusable = True  # False while a response is in flight / after errors
         self._connect()
 
-    def _connect(self):
-        ws_url = (
+    @classmethod
+    def _get_ws(cls) -> tuple[websocket.WebSocket, bool]:
+        """(socket, pooled): a recent pooled socket that answers a ping, or a
+        new connection."""
+        while True:
+            with cls._pool_lock:
+                ws, idle_since = cls._pool.pop() if cls._pool else (None, 0.0)
+            if ws is None:
+                break
+            if time.monotonic() - idle_since > cls.POOL_IDLE_SECONDS:
+                ws.close()  # likely closed server-side already
+                continue
+            try:
+                ws.ping()
+                return ws, True
+            except Exception:
+                ws.close()  # dropped while idle
+
+        ws = websocket.create_connection(cls._ws_url(), timeout=30)
+        logger.debug("Cartesia TTS WebSocket connected")
+        return ws, False
+
+    @staticmethod
+    def _ws_url() -> str:
+        return (
             f"wss://api.cartesia.ai/tts/websocket"
             f"?api_key={CARTESIA_API_KEY}"
             f"&cartesia_version={CARTESIA_VERSION}"
         )
-        self.ws = websocket.create_connection(ws_url, timeout=30)
-        logger.debug("Cartesia TTS WebSocket connected")
+
+    def _connect(self):
+        self.ws, self._pooled = self._get_ws()
+
+    def _reconnect(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+        self.ws = websocket.create_connection(self._ws_url(), timeout=30)
+        self._pooled = False
 
     def speak(self, text: str, on_chunk):
         """Generate audio for *text* and call ``on_chunk(b64_mulaw)`` for each chunk.
@@ -283,28 +381,62 @@ class CartesiaTTSStreamer:
             "continue": False,
         }
 
-        self.ws.send(json.dumps(msg))
-
-        while True:
-            raw = self.ws.recv()
-            if not raw:
-                break
-            data = json.loads(raw)
-
-            if data.get("type") == "chunk" and data.get("data"):
-                on_chunk(data["data"])
-
-            if data.get("done"):
-                break
-
-            if data.get("type") == "error":
-                logger.error("Cartesia TTS stream error: %s", data.get("error"))
-                break
+        self._reusable = False
+        payload = _json_dumps(msg)
+        if self._stream(payload, on_chunk) or not self._pooled:
+            return
+        # Pooled socket went away while idle; nothing was played yet, so
+        # resending on a fresh connection can't duplicate audio
+        logger.debug("Stale Cartesia TTS socket, reconnecting")
+        self._reconnect()
+        self._stream(payload, on_chunk)
+
+    def _stream(self, payload: str, on_chunk) -> bool:
+        """Send one request and forward its chunks. False if the socket was
+        closed before the first chunk arrived."""
+        started = False
+        try:
+            self.ws.send(payload)
+            while True:
+                opcode, raw = self.ws.recv_data()
+                # A close frame's payload is its status code, not JSON
+                if opcode == websocket.ABNF.OPCODE_CLOSE or not raw:
+                    return started
+                if opcode == websocket.ABNF.OPCODE_BINARY:
+                    # Raw mulaw frame — encode once for Twilio, no JSON hop
+                    on_chunk(base64.b64encode(raw).decode("ascii"))
+                    started = True
+                    continue
+                # Text frames: JSON chunk / done / error messages
+                data = _json_loads(raw)
+
+                if data.get("type") == "chunk" and data.get("data"):
+                    on_chunk(data["data"])
+                    started = True
+
+                if data.get("done"):
+                    self._reusable = True
+                    return True
+
+                if data.get("type") == "error":
+                    logger.error("Cartesia TTS stream error: %s", data.get("error"))
+                    return True
+        except (websocket.WebSocketException, OSError):
+            if started or not self._pooled:
+                raise
+            return False
 
     def close(self):
-        if self.ws:
-            try:
-                self.ws.close()
-            except Exception:
-                pass
-            self.ws = None
+        """Return the socket to the pool, or close it if it can't be reused."""
+        if not self.ws:
+            return
+        ws, self.ws = self.ws, None
+        if self._reusable and ws.connected:
+            with self._pool_lock:
+                if len(self._pool) < self.POOL_SIZE:
+                    self._pool.append((ws, time.monotonic()))
+                    return
+        try:
+            ws.close()
+        except Exception:
+            pass
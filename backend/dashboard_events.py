@@ -0,0 +1,50 @@
+"""Batched Socket.IO broadcasts to the live dashboard room.
+
+Inside a batched() block, dashboard events are queued and sent as a single
+"events_batch" emit ({"events": [[event, payload], ...]}); a lone event is
+sent as-is, so single updates look exactly like unbatched ones. Shared by
+app.py and twilio_stream.py so both paths send the same wire format.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DASHBOARD_ROOM = "dashboard"
+MAX_BATCH_EVENTS = 50  # flush early so one batch never grows unbounded
+
+# Events queued while inside batched(); None (the default) means emit immediately
+_pending_events: ContextVar[list | None] = ContextVar("_pending_events", default=None)
+
+
+def emit(socketio, event: str, payload: dict):
+    """Emit to the dashboard room, or queue it if a batch is open."""
+    pending = _pending_events.get()
+    if pending is None:
+        socketio.emit(event, payload, room=DASHBOARD_ROOM)
+        return
+    pending.append((event, payload))
+    if len(pending) >= MAX_BATCH_EVENTS:
+        flush(socketio)
+
+
+def flush(socketio):
+    """Send the queued dashboard events now, as one emit."""
+    pending = _pending_events.get()
+    if not pending:
+        return
+    if len(pending) == 1:
+        socketio.emit(*pending[0], room=DASHBOARD_ROOM)
+    else:
+        socketio.emit("events_batch", {"events": pending}, room=DASHBOARD_ROOM)
+    pending.clear()
+
+
+@contextmanager
+def batched(socketio):
+    """Collect dashboard broadcasts in this block into a single emit."""
+    token = _pending_events.set([])
+    try:
+        yield
+    finally:
+        flush(socketio)
+        _pending_events.reset(token)
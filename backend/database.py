@@ -34,6 +34,13 @@ CREATE TABLE IF NOT EXISTS intel (
     confidence REAL DEFAULT 0.5,
     timestamp TEXT NOT NULL DEFAULT (datetime('now'))
 );
+
+CREATE TABLE IF NOT EXISTS call_reports (
+    call_id TEXT PRIMARY KEY REFERENCES calls(id),
+    message_count INTEGER NOT NULL,
+    report TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
 """
 
 
@@ -157,13 +164,35 @@ def get_call_intel(call_id: str) -> list[dict]:
 
 
 def delete_call(call_id: str):
-    """Delete a call and all its messages and intel."""
+    """Delete a call and all its messages, intel and cached report."""
     with _get_conn() as conn:
+        conn.execute("DELETE FROM call_reports WHERE call_id = ?", (call_id,))
         conn.execute("DELETE FROM intel WHERE call_id = ?", (call_id,))
         conn.execute("DELETE FROM messages WHERE call_id = ?", (call_id,))
         conn.execute("DELETE FROM calls WHERE id = ?", (call_id,))
 
 
+# ── LLM report cache ───────────────────────────────────────────
+
+def get_call_report(call_id: str, message_count: int) -> str | None:
+    """Stored LLM report, if it was generated from `message_count` messages."""
+    with _get_conn() as conn:
+        row = conn.execute(
+            "SELECT report FROM call_reports WHERE call_id = ? AND message_count = ?",
+            (call_id, message_count),
+        ).fetchone()
+        return row["report"] if row else None
+
+
+def save_call_report(call_id: str, message_count: int, report: str):
+    now = datetime.now(timezone.utc).isoformat()
+    with _get_conn() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO call_reports (call_id, message_count, report, created_at) VALUES (?, ?, ?, ?)",
+            (call_id, message_count, report, now),
+        )
+
+
 # ── Stats / Analytics ──────────────────────────────────────────
 
 def get_stats() -> dict:
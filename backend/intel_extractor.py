@@ -30,6 +30,16 @@ _ORG_PATTERNS = [
     r"(?:this is|ye)\s+(.+?)(?:\s+(?:helpline|customer|service|support))",
 ]
 
+# Extracted field_name → key in the dashboard's "intel_update" event
+DASHBOARD_INTEL_FIELDS = {
+    "scammer_name": "scammer_name",
+    "scam_type": "scam_type",
+    "organization_claimed": "organization_claimed",
+    "bank_mentioned": "organization_claimed",
+    "upi_id": "upi_id",
+    "phone_number": "phone_number",
+}
+
 
 def extract_intel(text: str) -> list[dict]:
     """Extract intelligence from a single scammer message.
@@ -5,14 +5,23 @@ Environment variables:
     STT_PROVIDER: "sarvam" (default) or "cartesia"
 """
 
+import hashlib
 import logging
 import os
+import threading
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
 TTS_PROVIDER = os.getenv("TTS_PROVIDER", "sarvam").lower().strip()
 STT_PROVIDER = os.getenv("STT_PROVIDER", "sarvam").lower().strip()
 
+# Bounded LRU of synthesized audio: (text digest, language, speaker, rate) → WAV
+TTS_CACHE_MAX_BYTES = 8 * 1024 * 1024
+_tts_cache: OrderedDict[tuple, bytes] = OrderedDict()
+_tts_cache_bytes = 0
+_tts_cache_lock = threading.Lock()
+
 # Lazy-import providers to avoid loading unused API keys / sessions
 _sarvam = None
 _cartesia = None
@@ -77,6 +86,41 @@ def text_to_speech(
         return _get_sarvam().text_to_speech(text, language_code, speaker, sample_rate)
 
 
+def tts_cached(
+    text: str,
+    language_code: str = "hi-IN",
+    speaker: str = "kavya",
+    sample_rate: str = "8000",
+) -> bytes:
+    """text_to_speech() behind an in-memory LRU capped at TTS_CACHE_MAX_BYTES.
+
+    Repeated phrases (greetings, announcements, common fillers) skip the
+    provider round-trip entirely.
+    """
+    global _tts_cache_bytes
+    key = (
+        hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+        language_code, speaker, sample_rate,
+    )
+    with _tts_cache_lock:
+        audio = _tts_cache.get(key)
+        if audio is not None:
+            _tts_cache.move_to_end(key)
+            return audio
+
+    audio = text_to_speech(text, language_code, speaker, sample_rate)
+
+    if len(audio) <= TTS_CACHE_MAX_BYTES:
+        with _tts_cache_lock:
+            if key not in _tts_cache:
+                _tts_cache[key] = audio
+                _tts_cache_bytes += len(audio)
+            while _tts_cache_bytes > TTS_CACHE_MAX_BYTES:
+                _, evicted = _tts_cache.popitem(last=False)
+                _tts_cache_bytes -= len(evicted)
+    return audio
+
+
 def get_provider_info() -> dict:
     """Return current provider configuration for logging/health checks."""
     return {
@@ -23,10 +23,11 @@ import io
 
 from simple_websocket.errors import ConnectionClosed
 
+import dashboard_events
 from cartesia_service import CartesiaTTSStreamer
 from conversation import GREETING_TEXT
 from database import save_intel, save_message
-from intel_extractor import extract_intel
+from intel_extractor import DASHBOARD_INTEL_FIELDS, extract_intel
 from llm_service import chat_completion_streaming
 from speech_service import speech_to_text
 from voice_classifier import classify_audio
@@ -59,6 +60,18 @@ def _energy_vad(pcm16_frame: bytes, _sample_rate: int, threshold: int = 500) ->
     return rms > threshold
 
 
+PLAYBACK_CHUNK_BYTES = 640  # 80 ms at 8 kHz mulaw per outbound media message
+
+
+def encode_playback_frames(mulaw: bytes) -> tuple[str, ...]:
+    """Split raw mulaw into base64 media payloads ready for _send_audio_to_twilio."""
+    view = memoryview(mulaw)
+    return tuple(
+        base64.b64encode(view[i: i + PLAYBACK_CHUNK_BYTES]).decode("ascii")
+        for i in range(0, len(view), PLAYBACK_CHUNK_BYTES)
+    )
+
+
 class TwilioStreamHandler:
     """Handles a single Twilio Media Stream WebSocket connection.
 
@@ -84,14 +97,15 @@ class TwilioStreamHandler:
     # Classification phase duration (seconds)
     CLASSIFICATION_DURATION = 3.5
 
-    def __init__(self, ws, *, socketio, conversation_mgr, mute_state,
-                 greeting_mulaw=None, ai_detected_mulaw=None):
+    def __init__(self, ws, *, socketio, conversation_mgr, sessions,
+                 greeting_frames=(), ai_detected_frames=()):
         self.ws = ws
         self.socketio = socketio
         self.conversation_mgr = conversation_mgr
-        self.mute_state = mute_state
-        self.greeting_mulaw = greeting_mulaw
-        self.ai_detected_mulaw = ai_detected_mulaw
+        self.sessions = sessions  # call_sid → app.CallSession
+        # Pre-encoded clips from encode_playback_frames(), shared across calls
+        self.greeting_frames = greeting_frames
+        self.ai_detected_frames = ai_detected_frames
 
         # Stream identifiers (set on 'start' event)
         self.stream_sid = None
@@ -348,11 +362,8 @@ class TwilioStreamHandler:
 
     def _play_ai_detected_message(self):
         """Play the pre-cached 'Caller is classified as AI' audio."""
-        if self.ai_detected_mulaw:
-            chunk_size = 640  # 80 ms at 8 kHz mulaw
-            for i in range(0, len(self.ai_detected_mulaw), chunk_size):
-                chunk = self.ai_detected_mulaw[i: i + chunk_size]
-                b64 = base64.b64encode(chunk).decode("ascii")
+        if self.ai_detected_frames:
+            for b64 in self.ai_detected_frames:
                 self._send_audio_to_twilio(b64)
             self._send_mark("ai_detected_end")
         else:
@@ -404,28 +415,32 @@ class TwilioStreamHandler:
 
         logger.info("Scammer (call %s): %s", self.call_sid, transcript)
 
-        # 4. Save scammer message & broadcast
-        save_message(self.call_sid, "user", transcript)
-        self._broadcast_transcript("scammer", transcript)
+        # Steps 4–6 reach the dashboard as one batched emit
+        with dashboard_events.batched(self.socketio):
+            # 4. Save scammer message & broadcast
+            save_message(self.call_sid, "user", transcript)
+            self._broadcast_transcript("scammer", transcript)
+
+            # 5. Intel extraction
+            intel_items = extract_intel(transcript)
+            for item in intel_items:
+                save_intel(
+                    self.call_sid,
+                    item["field_name"],
+                    item["field_value"],
+                    item["confidence"],
+                )
+            self._broadcast_intel(intel_items)
+
+            # 6. Check mute
+            session = self.sessions.get(self.call_sid)
+            if session is not None and session.muted:
+                self._broadcast_status("MUTED")
+                return
 
-        # 5. Intel extraction
-        intel_items = extract_intel(transcript)
-        for item in intel_items:
-            save_intel(
-                self.call_sid,
-                item["field_name"],
-                item["field_value"],
-                item["confidence"],
-            )
-        self._broadcast_intel(intel_items)
-
-        # 6. Check mute
-        if self.mute_state.get(self.call_sid, False):
-            self._broadcast_status("MUTED")
-            return
+            self._broadcast_status("DEFENDING")
 
         # 7. LLM (streaming) → TTS (streaming) → Twilio
-        self._broadcast_status("DEFENDING")
 
         messages = self.conversation_mgr.add_user_message(
             self.call_sid, transcript
@@ -485,12 +500,9 @@ class TwilioStreamHandler:
     # ------------------------------------------------------------------
     def _send_greeting(self):
         """Stream the pre-cached greeting or generate it on the fly."""
-        if self.greeting_mulaw:
-            # Send cached raw mulaw in ~80 ms chunks
-            chunk_size = 640  # 80 ms at 8 kHz mulaw
-            for i in range(0, len(self.greeting_mulaw), chunk_size):
-                chunk = self.greeting_mulaw[i: i + chunk_size]
-                b64 = base64.b64encode(chunk).decode("ascii")
+        if self.greeting_frames:
+            # Cached greeting, already split into ~80 ms base64 payloads
+            for b64 in self.greeting_frames:
                 self._send_audio_to_twilio(b64)
             self._send_mark("greeting_end")
         else:
@@ -544,37 +556,26 @@ class TwilioStreamHandler:
     # ------------------------------------------------------------------
     #  Dashboard broadcasting
     # ------------------------------------------------------------------
+    def _emit_dashboard(self, event: str, payload: dict):
+        dashboard_events.emit(self.socketio, event, payload)
+
     def _broadcast_transcript(self, speaker: str, text: str):
-        self.socketio.emit(
+        self._emit_dashboard(
             "transcript_message",
             {"call_sid": self.call_sid, "speaker": speaker, "text": text},
-            room="dashboard",
         )
 
     def _broadcast_status(self, status: str):
-        self.socketio.emit(
-            "ai_status", {"status": status}, room="dashboard",
-        )
+        self._emit_dashboard("ai_status", {"status": status})
 
     def _broadcast_intel(self, intel_items: list[dict]):
         if not intel_items:
             return
         update = {}
         for item in intel_items:
-            field = item["field_name"]
-            value = item["field_value"]
-            if field == "scammer_name":
-                update["scammer_name"] = value
-            elif field == "scam_type":
-                update["scam_type"] = value
-            elif field == "organization_claimed":
-                update["organization_claimed"] = value
-            elif field == "bank_mentioned":
-                update["organization_claimed"] = value
-            elif field == "upi_id":
-                update["upi_id"] = value
-            elif field == "phone_number":
-                update["phone_number"] = value
+            key = DASHBOARD_INTEL_FIELDS.get(item["field_name"])
+            if key is not None:
+                update[key] = item["field_value"]
         if update:
             update["call_sid"] = self.call_sid
-            self.socketio.emit("intel_update", update, room="dashboard")
+            self._emit_dashboard("intel_update", update)